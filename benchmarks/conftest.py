@@ -0,0 +1,138 @@
+import os
+import yaml
+import pytest
+
+from typing import Any, Callable
+
+from synthetic import write_dataset
+
+from cenplot.lib.memory import RSSSampler
+
+BENCH_ENV = "CENPLOT_BENCH"
+"""
+Set to run benchmarks. Skipped otherwise so `make test` stays fast.
+"""
+SCALES_ENV = "CENPLOT_BENCH_SCALES"
+"""
+Comma-separated `length:window` scales in bp to benchmark.
+"""
+DEF_SCALES = "1000000:10000,5000000:5000,20000000:1000"
+# Max number of self-identity windows. ModDotPlot defaults to 1000 windows.
+MAX_IDENT_WINDOWS = 1000
+BENCH_DIR = os.path.dirname(__file__)
+
+
+def get_scales() -> list[tuple[int, int]]:
+    scales = []
+    for scale in os.environ.get(SCALES_ENV, DEF_SCALES).split(","):
+        length, window = scale.split(":")
+        scales.append((int(length), int(window)))
+    return scales
+
+
+def format_bp(bp: int) -> str:
+    for unit, size in (("Mbp", 1_000_000), ("kbp", 1_000)):
+        if bp >= size and bp % size == 0:
+            return f"{bp // size}{unit}"
+    return f"{bp}bp"
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if os.environ.get(BENCH_ENV):
+        return
+    skip = pytest.mark.skip(reason=f"Set {BENCH_ENV}=1 to run benchmarks.")
+    for item in items:
+        if str(item.path).startswith(BENCH_DIR):
+            item.add_marker(skip)
+
+
+def pytest_generate_tests(metafunc) -> None:
+    if "scale" in metafunc.fixturenames:
+        scales = get_scales()
+        metafunc.parametrize(
+            "scale",
+            scales,
+            ids=[
+                f"{format_bp(length)}-{format_bp(window)}" for length, window in scales
+            ],
+            scope="session",
+        )
+
+
+@pytest.fixture(scope="session")
+def dataset(scale: tuple[int, int], tmp_path_factory) -> dict[str, str]:
+    """
+    Synthetic files of each track data type at this scale. See `synthetic.write_dataset`.
+    """
+    length, window = scale
+    return write_dataset(
+        str(tmp_path_factory.mktemp("data")),
+        length,
+        window,
+        ident_window=max(window, length // MAX_IDENT_WINDOWS),
+    )
+
+
+@pytest.fixture(scope="session")
+def tracks_config(dataset: dict[str, str], tmp_path_factory) -> str:
+    """
+    `YAML` file with a track of each type using the synthetic files.
+    """
+    tracks: list[dict[str, Any]] = [
+        {"type": "hor", "path": dataset["hor"], "options": {"legend": True}},
+        {"type": "horsplit", "path": dataset["hor"], "options": {"legend": True}},
+        {"type": "horort", "path": dataset["hor"]},
+        {"type": "strand", "path": dataset["strand"]},
+        {"type": "label", "path": dataset["label"], "options": {"legend": True}},
+        {"type": "bar", "path": dataset["methyl"]},
+        {"type": "line", "path": dataset["methyl"]},
+        {"type": "localselfident", "path": dataset["identity"]},
+        {
+            "type": "selfident",
+            "path": dataset["identity"],
+            "proportion": 0.5,
+            "options": {"legend": True},
+        },
+    ]
+    for track in tracks:
+        track.setdefault("position", "relative")
+        track.setdefault("proportion", 0.1)
+
+    config = tmp_path_factory.mktemp("config") / "tracks.yaml"
+    with open(config, "wt") as fh:
+        yaml.safe_dump(
+            {"settings": {"format": "png", "dpi": 100}, "tracks": tracks}, fh
+        )
+    return str(config)
+
+
+@pytest.fixture(autouse=True)
+def no_cache_dir(monkeypatch) -> None:
+    # Time reading rather than reading cached results.
+    monkeypatch.delenv("CENPLOT_CACHE_DIR", raising=False)
+
+
+@pytest.fixture
+def profile(benchmark) -> Callable[..., Any]:
+    """
+    Benchmark a function and record the RSS of its first call in `extra_info`.
+    * `rss_peak` is the peak RSS of the process in bytes and `rss_delta` the increase over the RSS at the start.
+    * Memory freed by earlier benchmarks may be reused so `rss_delta` is a lower bound.
+    * If `setup` is given, it is called before each round and returns the args and kwargs of the function.
+    """
+
+    def run(fn: Callable[..., Any], *args, setup=None, rounds: int = 5, **kwargs):
+        sampler = RSSSampler(interval=0.005)
+        first_args, first_kwargs = setup() if setup else (args, kwargs)
+        with sampler.running():
+            window = sampler.open()
+            fn(*first_args, **first_kwargs)
+            sampler.close(window)
+        benchmark.extra_info["rss_peak"] = window.peak
+        benchmark.extra_info["rss_delta"] = window.peak - window.start
+
+        if setup:
+            return benchmark.pedantic(fn, setup=setup, rounds=rounds)
+        return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=rounds)
+
+    return run
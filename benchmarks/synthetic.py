@@ -0,0 +1,251 @@
+"""
+Deterministic generators of synthetic centromere track data at a configurable scale.
+
+Each generator writes a headerless TSV file and returns its path. The same arguments always produce the same file.
+
+```bash
+python benchmarks/synthetic.py -o bench_data -l 5000000 -w 5000
+```
+"""
+
+import os
+import math
+import random
+import argparse
+
+from typing import Iterator
+
+# Monomer size of alpha-satellite. See HORTrackSettings.mer_size.
+MER_SIZE = 171
+# Number of monomers in most HORs of an array and their weight.
+HOR_MERS = {11: 0.85, 10: 0.05, 12: 0.04, 6: 0.03, 1: 0.02, 16: 0.01}
+DEF_CHROM = "chrSyn"
+DEF_SEED = 42
+
+
+def _windows(length: int, window: int) -> Iterator[tuple[int, int]]:
+    for st in range(0, length, window):
+        yield st, min(st + window, length)
+
+
+def _cdrs(length: int, window: int, seed: int) -> list[tuple[int, int]]:
+    # Centromere dip regions. Hypomethylated stretches of a few windows.
+    rng = random.Random(seed)
+    cdrs = []
+    st = rng.randrange(0, 50) * window
+    while st < length:
+        end = min(st + rng.randint(2, 10) * window, length)
+        cdrs.append((st, end))
+        st = end + rng.randint(20, 100) * window
+    return cdrs
+
+
+def write_hor_bed9(
+    outfile: str, length: int, *, chrom: str = DEF_CHROM, seed: int = DEF_SEED
+) -> str:
+    """
+    Write a HOR BED9 file like those of `HumAS-HMMER` and `stv` with one row per HOR unit.
+    * Most HORs are the same live HOR with a few variants and dead HORs between arrays.
+    * Strand flips between arrays.
+    """
+    rng = random.Random(seed)
+    mers, weights = list(HOR_MERS), list(HOR_MERS.values())
+    st, strand, array_end = 0, "+", 0
+    with open(outfile, "wt") as fh:
+        while st < length:
+            if st >= array_end:
+                array_end = st + rng.randint(100, 1000) * MER_SIZE * 11
+                strand = "-" if strand == "+" else "+"
+            mer = rng.choices(mers, weights)[0]
+            end = min(st + mer * MER_SIZE + rng.randint(-5, 5), length)
+            live = "L" if mer != 1 else "d"
+            name = f"S1C1H1{live}.{mer}"
+            fh.write(f"{chrom}\t{st}\t{end}\t{name}\t0\t{strand}\t{st}\t{end}\t0,0,0\n")
+            st = end + 1
+    return outfile
+
+
+def write_strand_bed9(
+    outfile: str,
+    length: int,
+    window: int,
+    *,
+    chrom: str = DEF_CHROM,
+    seed: int = DEF_SEED,
+) -> str:
+    """
+    Write a strand BED9 file of alternating forward and reverse blocks of a few to a few dozen windows.
+    """
+    rng = random.Random(seed)
+    st, forward = 0, True
+    with open(outfile, "wt") as fh:
+        while st < length:
+            end = min(st + rng.randint(2, 40) * window, length)
+            name, strand, color = (
+                ("Forward", "+", "255,0,0") if forward else ("Reverse", "-", "0,0,255")
+            )
+            fh.write(
+                f"{chrom}\t{st}\t{end}\t{name}\t0\t{strand}\t{st}\t{end}\t{color}\n"
+            )
+            st, forward = end, not forward
+    return outfile
+
+
+def write_label_bed(
+    outfile: str,
+    length: int,
+    window: int,
+    *,
+    chrom: str = DEF_CHROM,
+    seed: int = DEF_SEED,
+) -> str:
+    """
+    Write a label BED4 file of centromere dip regions (CDRs).
+    """
+    with open(outfile, "wt") as fh:
+        for st, end in _cdrs(length, window, seed):
+            fh.write(f"{chrom}\t{st}\t{end}\tCDR\n")
+    return outfile
+
+
+def write_methyl_bed(
+    outfile: str,
+    length: int,
+    window: int,
+    *,
+    chrom: str = DEF_CHROM,
+    seed: int = DEF_SEED,
+) -> str:
+    """
+    Write a BED4 file of mean CpG methylation per window. Methylation dips within the CDRs of `write_label_bed`.
+    """
+    rng = random.Random(seed)
+    cdrs = iter(_cdrs(length, window, seed))
+    cdr = next(cdrs, None)
+    with open(outfile, "wt") as fh:
+        for st, end in _windows(length, window):
+            while cdr and cdr[1] <= st:
+                cdr = next(cdrs, None)
+            mean = 25.0 if cdr and cdr[0] <= st else 75.0
+            value = min(max(rng.gauss(mean, 5.0), 0.0), 100.0)
+            fh.write(f"{chrom}\t{st}\t{end}\t{value:.2f}\n")
+    return outfile
+
+
+def write_identity_bedpe(
+    outfile: str,
+    length: int,
+    window: int,
+    *,
+    chrom: str = DEF_CHROM,
+    seed: int = DEF_SEED,
+    min_ident: float = 0.0,
+) -> str:
+    """
+    Write a self-identity BEDPE file like those of `ModDotPlot` with the pairwise identity of all windows in the upper triangle.
+    * Identity decays with distance between windows. Pairs below `min_ident` are omitted.
+    * Rows grow quadratically with the number of windows. `ModDotPlot` defaults to 1000 windows.
+    """
+    rng = random.Random(seed)
+    n_windows = math.ceil(length / window)
+    query = chrom
+    with open(outfile, "wt") as fh:
+        for i in range(n_windows):
+            q_st, q_end = i * window + 1, min((i + 1) * window, length)
+            for j in range(i, n_windows):
+                if i == j:
+                    ident = 100.0
+                else:
+                    dst = (j - i) / n_windows
+                    ident = min(rng.gauss(99.5 - 4.0 * dst, 0.5), 100.0)
+                if ident < min_ident:
+                    continue
+                r_st, r_end = j * window + 1, min((j + 1) * window, length)
+                fh.write(
+                    f"{query}\t{q_st}\t{q_end}\t{query}\t{r_st}\t{r_end}\t{ident}\n"
+                )
+    return outfile
+
+
+def write_dataset(
+    outdir: str,
+    length: int,
+    window: int,
+    *,
+    ident_window: int | None = None,
+    chrom: str = DEF_CHROM,
+    seed: int = DEF_SEED,
+) -> dict[str, str]:
+    """
+    Write one file of each track type to `outdir`.
+
+    # Args
+    * `outdir`
+        * Output dir.
+    * `length`
+        * Length of the region in bp.
+    * `window`
+        * Window size in bp of the strand, label, and methylation files.
+    * `ident_window`
+        * Window size in bp of the self-identity file. Defaults to `window`.
+    * `chrom`
+        * Chrom name.
+    * `seed`
+        * Random seed.
+
+    # Returns
+    * Path of each file by track data type. `hor`, `strand`, `label`, `methyl`, and `identity`.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    prefix = os.path.join(outdir, f"{chrom}_{length}_{window}")
+    return {
+        "hor": write_hor_bed9(f"{prefix}_hor.bed", length, chrom=chrom, seed=seed),
+        "strand": write_strand_bed9(
+            f"{prefix}_strand.bed", length, window, chrom=chrom, seed=seed
+        ),
+        "label": write_label_bed(
+            f"{prefix}_label.bed", length, window, chrom=chrom, seed=seed
+        ),
+        "methyl": write_methyl_bed(
+            f"{prefix}_methyl.bed", length, window, chrom=chrom, seed=seed
+        ),
+        "identity": write_identity_bedpe(
+            f"{prefix}_{ident_window or window}_identity.bed",
+            length,
+            ident_window or window,
+            chrom=chrom,
+            seed=seed,
+        ),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate synthetic track data.")
+    ap.add_argument("-o", "--outdir", required=True, help="Output dir.")
+    ap.add_argument("-l", "--length", type=int, default=5_000_000, help="Length in bp.")
+    ap.add_argument("-w", "--window", type=int, default=5_000, help="Window in bp.")
+    ap.add_argument(
+        "--ident_window",
+        type=int,
+        default=None,
+        help="Window in bp of the self-identity file. Defaults to --window.",
+    )
+    ap.add_argument("--chrom", default=DEF_CHROM, help="Chrom name.")
+    ap.add_argument("--seed", type=int, default=DEF_SEED, help="Random seed.")
+    args = ap.parse_args()
+
+    files = write_dataset(
+        args.outdir,
+        args.length,
+        args.window,
+        ident_window=args.ident_window,
+        chrom=args.chrom,
+        seed=args.seed,
+    )
+    for typ, file in files.items():
+        print(f"{typ}\t{file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+import pytest
+import matplotlib.pyplot as plt
+
+from cenplot.lib.draw import (
+    draw_bar,
+    draw_hor,
+    draw_hor_ort,
+    draw_label,
+    draw_line,
+    draw_local_self_ident,
+    draw_self_ident,
+    draw_strand,
+    plot_tracks,
+)
+from cenplot.lib.io import read_tracks
+from cenplot.lib.track.types import Track, TrackType
+
+pytest.importorskip("pytest_benchmark")
+
+DRAW_FNS = {
+    TrackType.HOR: draw_hor,
+    TrackType.HORSplit: draw_hor,
+    TrackType.HOROrt: draw_hor_ort,
+    TrackType.Strand: draw_strand,
+    TrackType.Label: draw_label,
+    TrackType.Bar: draw_bar,
+    TrackType.Line: draw_line,
+    TrackType.LocalSelfIdent: draw_local_self_ident,
+    TrackType.SelfIdent: draw_self_ident,
+}
+
+
+@pytest.fixture(scope="session")
+def track_list(tracks_config):
+    with open(tracks_config, "rb") as fh:
+        return read_tracks(fh)
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+@pytest.mark.parametrize("typ", list(DRAW_FNS))
+def test_draw(profile, track_list, typ):
+    tracks, _ = track_list
+    # Split HOR tracks are one track per HOR. Draw the first.
+    track: Track = next(track for track in tracks.tracks if track.opt == typ)
+
+    def setup():
+        _, (ax, legend_ax) = plt.subplots(1, 2)
+        return (), {"ax": ax, "legend_ax": legend_ax, "track": track}
+
+    profile(DRAW_FNS[typ], setup=setup)
+
+
+def test_plot_tracks(profile, track_list, tmp_path):
+    tracks, settings = track_list
+    profile(
+        plot_tracks,
+        tracks.tracks,
+        settings,
+        str(tmp_path),
+        "chrSyn",
+        release=True,
+        rounds=3,
+    )
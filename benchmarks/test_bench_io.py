@@ -0,0 +1,65 @@
+import copy
+import yaml
+import pytest
+
+from cenplot.lib.io import (
+    read_bed9,
+    read_bed_hor,
+    read_bed_identity,
+    read_bed_label,
+    read_track,
+    read_tracks,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+TRACK_TYPES = [
+    "hor",
+    "horsplit",
+    "horort",
+    "strand",
+    "label",
+    "bar",
+    "line",
+    "localselfident",
+    "selfident",
+]
+
+
+def test_read_bed9(profile, dataset):
+    profile(read_bed9, dataset["strand"])
+
+
+def test_read_bed_label(profile, dataset):
+    profile(read_bed_label, dataset["label"])
+
+
+def test_read_bed_hor(profile, dataset):
+    profile(read_bed_hor, dataset["hor"])
+
+
+@pytest.mark.parametrize("mode", ["1D", "2D"])
+def test_read_bed_identity(profile, dataset, mode):
+    profile(read_bed_identity, dataset["identity"], mode=mode)
+
+
+@pytest.mark.parametrize("typ", TRACK_TYPES)
+def test_read_track(profile, tracks_config, typ):
+    with open(tracks_config, "rt") as fh:
+        config = yaml.safe_load(fh)
+    track = next(track for track in config["tracks"] if track["type"] == typ)
+
+    def setup():
+        # Reading modifies options.
+        return (copy.deepcopy(track),), {}
+
+    profile(lambda track: list(read_track(track)), setup=setup)
+
+
+@pytest.mark.parametrize("threads", [1, None])
+def test_read_tracks(profile, tracks_config, threads):
+    def read():
+        with open(tracks_config, "rb") as fh:
+            return read_tracks(fh, threads=threads)
+
+    profile(read)
@@ -202,89 +202,139 @@ Examples of both the CLI and Python API can be found in the root of `cenplot`'s
 """
 
 import logging
-
-from .lib.draw import (
-    draw_hor,
-    draw_hor_ort,
-    draw_label,
-    draw_strand,
-    draw_self_ident,
-    draw_bar,
-    draw_line,
-    draw_legend,
-    draw_self_ident_hist,
-    draw_local_self_ident,
-    plot_tracks,
-    merge_plots,
-    PlotSettings,
-)
-from .lib.io import (
-    read_bed9,
-    read_bed_hor,
-    read_bed_identity,
-    read_bed_label,
-    read_track,
-    read_tracks,
-)
-from .lib.track import (
-    Track,
-    TrackType,
-    TrackPosition,
-    TrackList,
-    LegendPosition,
-    TrackSettings,
-    SelfIdentTrackSettings,
-    LineTrackSettings,
-    LocalSelfIdentTrackSettings,
-    HORTrackSettings,
-    HOROrtTrackSettings,
-    StrandTrackSettings,
-    BarTrackSettings,
-    LabelTrackSettings,
-    PositionTrackSettings,
-    LegendTrackSettings,
-    SpacerTrackSettings,
-)
+import importlib
+
+from typing import Any, TYPE_CHECKING
+
+# Public names for type checkers. Listed in __all__ with _LAZY_SUBMODULES below.
+if TYPE_CHECKING:
+    from .lib.draw import (  # noqa: F401
+        draw_hor,
+        draw_hor_ort,
+        draw_label,
+        draw_strand,
+        draw_self_ident,
+        draw_bar,
+        draw_line,
+        draw_legend,
+        draw_self_ident_hist,
+        draw_local_self_ident,
+        plot_tracks,
+        merge_plots,
+        merge_pngs,
+        merge_pdfs,
+        PlotSettings,
+        FigureTemplate,
+    )
+    from .lib.io import (  # noqa: F401
+        read_bed9,
+        read_bed_hor,
+        read_bed_identity,
+        read_bed_label,
+        read_track,
+        read_tracks,
+        TrackCache,
+        SharedTracks,
+        estimate_tracks,
+        ChromEstimate,
+        TrackEstimate,
+    )
+    from .lib.timing import Timings  # noqa: F401
+    from .lib.track import (  # noqa: F401
+        Track,
+        TrackType,
+        TrackPosition,
+        TrackList,
+        LegendPosition,
+        TrackSettings,
+        SelfIdentTrackSettings,
+        LineTrackSettings,
+        LocalSelfIdentTrackSettings,
+        HORTrackSettings,
+        HOROrtTrackSettings,
+        StrandTrackSettings,
+        BarTrackSettings,
+        LabelTrackSettings,
+        PositionTrackSettings,
+        LegendTrackSettings,
+        SpacerTrackSettings,
+    )
 
 __author__ = "Keith Oshima (oshimak@pennmedicine.upenn.edu)"
 __license__ = "MIT"
-__all__ = [
-    "plot_tracks",
-    "merge_plots",
-    "draw_hor",
-    "draw_hor_ort",
-    "draw_label",
-    "draw_self_ident",
-    "draw_self_ident_hist",
-    "draw_local_self_ident",
-    "draw_bar",
-    "draw_line",
-    "draw_strand",
-    "draw_legend",
-    "read_bed9",
-    "read_bed_hor",
-    "read_bed_identity",
-    "read_bed_label",
-    "read_track",
-    "read_tracks",
-    "Track",
-    "TrackType",
-    "TrackPosition",
-    "TrackList",
-    "LegendPosition",
-    "PlotSettings",
-    "TrackSettings",
-    "SelfIdentTrackSettings",
-    "LocalSelfIdentTrackSettings",
-    "StrandTrackSettings",
-    "HORTrackSettings",
-    "HOROrtTrackSettings",
-    "BarTrackSettings",
-    "LineTrackSettings",
-    "LabelTrackSettings",
-    "PositionTrackSettings",
-    "LegendTrackSettings",
-    "SpacerTrackSettings",
-]
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public names by submodule. Each is imported from its submodule on first access so importing cenplot doesn't load matplotlib or polars.
+# Names must also be imported under TYPE_CHECKING above.
+_LAZY_SUBMODULES = {
+    ".lib.draw": (
+        "plot_tracks",
+        "merge_plots",
+        "merge_pngs",
+        "merge_pdfs",
+        "draw_hor",
+        "draw_hor_ort",
+        "draw_label",
+        "draw_self_ident",
+        "draw_self_ident_hist",
+        "draw_local_self_ident",
+        "draw_bar",
+        "draw_line",
+        "draw_strand",
+        "draw_legend",
+        "PlotSettings",
+        "FigureTemplate",
+    ),
+    ".lib.io": (
+        "read_bed9",
+        "read_bed_hor",
+        "read_bed_identity",
+        "read_bed_label",
+        "read_track",
+        "read_tracks",
+        "TrackCache",
+        "SharedTracks",
+        "estimate_tracks",
+        "ChromEstimate",
+        "TrackEstimate",
+    ),
+    ".lib.timing": ("Timings",),
+    ".lib.track": (
+        "Track",
+        "TrackType",
+        "TrackPosition",
+        "TrackList",
+        "LegendPosition",
+        "TrackSettings",
+        "SelfIdentTrackSettings",
+        "LocalSelfIdentTrackSettings",
+        "StrandTrackSettings",
+        "HORTrackSettings",
+        "HOROrtTrackSettings",
+        "BarTrackSettings",
+        "LineTrackSettings",
+        "LabelTrackSettings",
+        "PositionTrackSettings",
+        "LegendTrackSettings",
+        "SpacerTrackSettings",
+    ),
+}
+_LAZY_ATTRS = {
+    name: submodule for submodule, names in _LAZY_SUBMODULES.items() for name in names
+}
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(submodule, __name__), name)
+    # Cache so __getattr__ is only called once per name.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,190 @@
+import os
+import csv
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+
+from typing import Any, NamedTuple, TextIO, TYPE_CHECKING
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from ..lib.defaults import CACHE_DIR_ENV
+from .draw import DrawResult, draw_chrom, log_result, submit_bounded
+
+if TYPE_CHECKING:
+    SubArgumentParser = argparse._SubParsersAction[argparse.ArgumentParser]
+else:
+    SubArgumentParser = Any
+
+
+SUMMARY_COLS = (
+    "config",
+    "chrom",
+    "outdir",
+    "status",
+    "read_time",
+    "plot_time",
+    "files",
+    "error",
+)
+
+
+class BatchJob(NamedTuple):
+    """
+    Single row of a batch manifest.
+    """
+
+    config: str
+    chrom: str
+    outdir: str
+
+
+def read_manifest(infile: str, default_outdir: str) -> list[BatchJob]:
+    """
+    Read a batch manifest of jobs.
+    * `json`
+        * List of objects with the keys `config`, `chrom`, and, optionally, `outdir`.
+    * Otherwise, TSV with a header with the same columns.
+    """
+    with open(infile, "rt") as fh:
+        if infile.endswith(".json"):
+            rows = json.load(fh)
+        else:
+            rows = list(csv.DictReader(fh, delimiter="\t"))
+
+    jobs = []
+    for i, row in enumerate(rows):
+        try:
+            config, chrom = row["config"], row["chrom"]
+        except KeyError as err:
+            raise ValueError(f"Missing column {err} in row {i} of {infile}.") from err
+        jobs.append(BatchJob(config, chrom, row.get("outdir") or default_outdir))
+    return jobs
+
+
+def add_batch_cli(parser: SubArgumentParser) -> None:
+    ap = parser.add_parser(
+        "batch",
+        description="Draw many configs and regions with one shared process pool.",
+    )
+    ap.add_argument(
+        "-m",
+        "--manifest",
+        required=True,
+        type=str,
+        help="TSV with a header or JSON list of jobs with the fields: {config, chrom, outdir}. outdir is optional.",
+    )
+    ap.add_argument(
+        "-d",
+        "--outdir",
+        help="Default output dir of jobs without an outdir.",
+        type=str,
+        default=".",
+    )
+    ap.add_argument(
+        "-s",
+        "--summary",
+        type=argparse.FileType("wt"),
+        default="-",
+        help="Output TSV summary with the status and timings of each job.",
+    )
+    ap.add_argument("-p", "--processes", type=int, default=4, help="Processes to run.")
+    ap.add_argument(
+        "--max_in_flight",
+        type=int,
+        default=None,
+        help="Max number of jobs submitted to processes at once. Defaults to twice the number of processes.",
+    )
+    ap.add_argument(
+        "--template",
+        action="store_true",
+        help="Build the figure once per process and reuse it across jobs with the same track layout.",
+    )
+    ap.add_argument(
+        "--preview",
+        action="store_true",
+        help="Draw fast, low resolution png previews with the same layout. See PlotSettings.preview.",
+    )
+    ap.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help=f"Dir to cache slow to compute track data, like HOR array lengths and local self-identity, across runs. Defaults to the {CACHE_DIR_ENV} environment variable.",
+    )
+    return None
+
+
+def draw_job(job: BatchJob, *, preview: bool, template: bool) -> DrawResult:
+    """
+    Read the config of a job and plot its chrom. Run in each worker.
+    """
+    with open(job.config, "rb") as fh:
+        config = fh.read()
+    return draw_chrom(config, job.chrom, job.outdir, preview=preview, template=template)
+
+
+def write_summary(
+    summary: TextIO,
+    jobs: list[BatchJob],
+    results: list[DrawResult | BaseException | None],
+) -> None:
+    writer = csv.writer(summary, delimiter="\t", lineterminator="\n")
+    writer.writerow(SUMMARY_COLS)
+    for job, res in zip(jobs, results):
+        if isinstance(res, DrawResult):
+            row = (
+                "ok",
+                f"{res.read_time:.3f}",
+                f"{res.plot_time:.3f}",
+                ",".join(res.files),
+                "",
+            )
+        else:
+            row = ("failed", "", "", "", repr(res) if res else "")
+        writer.writerow((job.config, job.chrom, job.outdir, *row))
+
+
+def batch(
+    manifest: str,
+    outdir: str,
+    summary: TextIO,
+    processes: int,
+    max_in_flight: int | None = None,
+    template: bool = False,
+    preview: bool = False,
+) -> int:
+    jobs = read_manifest(manifest, outdir)
+    for job_outdir in set(job.outdir for job in jobs):
+        os.makedirs(job_outdir, exist_ok=True)
+
+    logging.info(f"Running {len(jobs)} jobs with {processes} processes.")
+    start = time.perf_counter()
+    # Results in manifest order.
+    results: list[DrawResult | BaseException | None] = [None] * len(jobs)
+    # Workers are started once and reused for every job.
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        for idx, job, future in submit_bounded(
+            pool,
+            partial(draw_job, preview=preview, template=template),
+            jobs,
+            max_in_flight or 2 * processes,
+        ):
+            err = future.exception()
+            if err:
+                logging.error(f"Failed to plot {job.chrom} of {job.config} ({err})")
+                results[idx] = err
+                continue
+            res = future.result()
+            log_result(res)
+            results[idx] = res
+
+    write_summary(summary, jobs, results)
+    n_failed = sum(not isinstance(res, DrawResult) for res in results)
+    logging.info(
+        f"Finished {len(jobs) - n_failed} of {len(jobs)} jobs in {time.perf_counter() - start:.2f}s."
+    )
+    return 1 if n_failed else 0
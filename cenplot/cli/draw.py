@@ -1,24 +1,58 @@
+import io
 import os
 import shutil
 import sys
+import tempfile
+import time
 import logging
 import argparse
 import multiprocessing
 
-import polars as pl
-
-from typing import Any, BinaryIO, TYPE_CHECKING
-from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    BinaryIO,
+    TextIO,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+    TYPE_CHECKING,
+)
+from functools import partial
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    FIRST_COMPLETED,
+    wait,
+)
 
-from cenplot import (
-    plot_tracks,
-    merge_plots,
-    read_tracks,
-    Track,
-    PlotSettings,
+from ..lib.defaults import CACHE_DIR_ENV
+from ..lib.timing import timed
+from .manifest import (
+    MANIFEST_FILE,
+    RenderManifest,
+    get_config_digest,
+    get_render_key,
 )
 
+# Plotting dependencies are imported where used so the CLI and spawned workers start quickly.
 if TYPE_CHECKING:
+    from cenplot import (
+        FigureTemplate,
+        SharedTracks,
+        Timings,
+        Track,
+        TrackCache,
+        PlotSettings,
+    )
+    from cenplot.lib.timing import Timing
+
+    from cenplot.lib.io.stats import ChromStats
+
     SubArgumentParser = argparse._SubParsersAction[argparse.ArgumentParser]
 else:
     SubArgumentParser = Any
@@ -31,50 +65,382 @@ logging.basicConfig(
 )
 
 
-def get_draw_args(
-    input_tracks: BinaryIO, chroms: list[str], share_xlim: bool, outdir: str
-) -> list[tuple[list[Track], PlotSettings, str, str]]:
-    inputs = []
-    tracks_settings = [
-        (chrom, *read_tracks(input_tracks, chrom=chrom)) for chrom in chroms
-    ]
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Figure template of this process. Reused across all chroms plotted by a worker.
+_TEMPLATE: "FigureTemplate | None" = None
+
+
+def set_rc_params() -> None:
+    """
+    Set matplotlib parameters of the CLI. Called in the main process and in each worker.
+    """
+    from matplotlib import rcParams
+
+    rcParams["pdf.use14corefonts"] = True
+    rcParams["text.usetex"] = False
+
+
+def plot_tracks_template(
+    tracks: "list[Track]", settings: "PlotSettings", outdir: str, chrom: str
+) -> tuple[Any, Any, list[str]]:
+    from cenplot import plot_tracks, FigureTemplate
+
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = FigureTemplate()
+    return plot_tracks(tracks, settings, outdir, chrom, template=_TEMPLATE)
+
+
+def get_tracks(
+    config: bytes,
+    chrom: str,
+    *,
+    xlim: tuple[int, int] | None = None,
+    preview: bool = False,
+    track_cache: "TrackCache | None" = None,
+) -> "tuple[list[Track], PlotSettings]":
+    """
+    Read the tracks of a single chrom from the contents of a TOML or YAML file.
+    """
+    import polars as pl
+    from cenplot import read_tracks
+
+    tracks_summary, plot_settings = read_tracks(
+        io.BytesIO(config), chrom=chrom, track_cache=track_cache
+    )
+    if xlim:
+        plot_settings.xlim = xlim
+    if preview:
+        plot_settings.preview = True
+    chrom_no_coords = chrom.rsplit(":", 1)[0]
+
+    tracks = []
+    for trk in tracks_summary.tracks:
+        if not trk.data.is_empty():
+            try:
+                has_no_coords = chrom_no_coords in trk.data["chrom"]
+            except Exception:
+                has_no_coords = False
+
+            if has_no_coords:
+                trk.data = trk.data.filter(pl.col("chrom") == chrom_no_coords)
+            else:
+                trk.data = trk.data.filter(pl.col("chrom") == chrom)
+
+        tracks.append(trk)
+
+    return tracks, plot_settings
+
+
+def get_chrom_stats(config: bytes, chroms: list[str]) -> "dict[str, ChromStats | None]":
+    """
+    Get the cached statistics of each chrom. `None` for chroms not read before. See `cenplot.lib.io.stats.read_chrom_stats`.
+    """
+    from cenplot.lib.io.tracks import load_config
+    from cenplot.lib.io.stats import read_chrom_stats
+
+    dict_settings = load_config(io.BytesIO(config))
+    return {chrom: read_chrom_stats(dict_settings, chrom) for chrom in chroms}
+
+
+def get_shared_xlim(
+    xlims: Iterable[tuple[int, int] | None],
+) -> tuple[int, int]:
     xmin_all, xmax_all = sys.maxsize, 0
-    if share_xlim:
-        for *_, settings in tracks_settings:
-            if settings.xlim:
-                xmin, xmax = settings.xlim
-                xmin_all = min(xmin_all, xmin)
-                xmax_all = max(xmax_all, xmax)
-
-    for chrom, tracks_summary, plot_settings in tracks_settings:
-        if share_xlim:
-            plot_settings.xlim = (xmin_all, xmax_all)
-        chrom_no_coords = chrom.rsplit(":", 1)[0]
-
-        tracks = []
-        for trk in tracks_summary.tracks:
-            if not trk.data.is_empty():
-                try:
-                    has_no_coords = chrom_no_coords in trk.data["chrom"]
-                except Exception:
-                    has_no_coords = False
-
-                if has_no_coords:
-                    trk.data = trk.data.filter(pl.col("chrom") == chrom_no_coords)
-                else:
-                    trk.data = trk.data.filter(pl.col("chrom") == chrom)
+    for xlim in xlims:
+        if xlim:
+            xmin, xmax = xlim
+            xmin_all = min(xmin_all, xmin)
+            xmax_all = max(xmax_all, xmax)
+    return xmin_all, xmax_all
+
+
+class DrawResult(NamedTuple):
+    """
+    Result of drawing a single chrom. Returned by workers instead of the figure.
+    """
+
+    chrom: str
+    files: list[str]
+    sizes: list[int]
+    """
+    Size of each file in bytes.
+    """
+    read_time: float
+    plot_time: float
+    timings: "list[Timing] | None" = None
+    """
+    Timings of each stage recorded by the worker if requested. See `cenplot.Timings`.
+    """
+
 
-            tracks.append(trk)
+@contextmanager
+def collect_timings(enabled: bool, memory: bool = False) -> "Iterator[Timings | None]":
+    """
+    Collect timings of this process within this context if `enabled`.
+    * If `memory`, also sample the peak RSS of each stage.
+    """
+    if not enabled:
+        yield None
+        return
 
-        inputs.append(
-            (
+    from cenplot import Timings
+
+    timings = Timings(memory=memory)
+    with timings.collect():
+        yield timings
+
+
+def add_format(settings: "PlotSettings", fmt: str) -> None:
+    """
+    Add an output format to plot settings if not already included.
+    """
+    formats = [settings.format] if isinstance(settings.format, str) else settings.format
+    if fmt not in formats:
+        settings.format = [*formats, fmt]  # type: ignore[list-item]
+
+
+def plot_chrom(
+    tracks: "list[Track]",
+    settings: "PlotSettings",
+    chrom: str,
+    outdir: str,
+    *,
+    read_time: float,
+    template: bool = False,
+    merge_format: str | None = None,
+) -> DrawResult:
+    """
+    Plot the tracks of a single chrom.
+    * If `merge_format`, also save the plot in this format so it can be merged.
+    """
+    from cenplot import plot_tracks
+
+    set_rc_params()
+    if merge_format:
+        add_format(settings, merge_format)
+
+    start = time.perf_counter()
+    with timed("plot", chrom=chrom):
+        if template:
+            plot = plot_tracks_template(tracks, settings, outdir, chrom)
+        else:
+            # Free figure once written.
+            plot = plot_tracks(tracks, settings, outdir, chrom, release=True)
+    plot_time = time.perf_counter() - start
+
+    files = plot[2]
+    return DrawResult(
+        chrom,
+        files,
+        [os.path.getsize(file) for file in files],
+        read_time,
+        plot_time,
+    )
+
+
+def draw_chrom(
+    config: bytes,
+    chrom: str,
+    outdir: str,
+    *,
+    xlim: tuple[int, int] | None = None,
+    preview: bool = False,
+    template: bool = False,
+    merge_format: str | None = None,
+    timings: bool = False,
+    memory: bool = False,
+) -> DrawResult:
+    """
+    Read and plot the tracks of a single chrom. Run in each worker so reading is also parallelized.
+    * If no track has data, nothing is plotted and the result has no files.
+    * If `merge_format`, also save the plot in this format so it can be merged.
+    * If `timings`, return the timings of each stage.
+    * If `memory`, include the peak RSS of each stage in the timings.
+    """
+    from cenplot.lib.io.utils import NoTrackDataError
+
+    with collect_timings(timings, memory) as collector:
+        start = time.perf_counter()
+        try:
+            tracks, settings = get_tracks(config, chrom, xlim=xlim, preview=preview)
+        except NoTrackDataError:
+            res = DrawResult(chrom, [], [], time.perf_counter() - start, 0.0)
+        else:
+            read_time = time.perf_counter() - start
+            res = plot_chrom(
                 tracks,
-                plot_settings,
-                outdir,
+                settings,
                 chrom,
+                outdir,
+                read_time=read_time,
+                template=template,
+                merge_format=merge_format,
             )
+    return res._replace(timings=collector.records) if collector else res
+
+
+def read_chrom_shared(
+    config: bytes,
+    chrom: str,
+    *,
+    shared_dir: str,
+    preview: bool = False,
+    timings: bool = False,
+    memory: bool = False,
+) -> "tuple[SharedTracks | None, PlotSettings | None, float, list[Timing] | None]":
+    """
+    Read the tracks of a single chrom and write their data to `shared_dir` so another worker can plot them without reading them again. See `cenplot.SharedTracks`.
+
+    # Returns
+    * Shared tracks, plot settings, the time taken to read them, and the timings of each stage if `timings`.
+    * Shared tracks and plot settings are `None` if no track has data.
+    """
+    from cenplot import SharedTracks
+    from cenplot.lib.io.utils import NoTrackDataError
+
+    shared: "SharedTracks | None" = None
+    settings: "PlotSettings | None" = None
+    with collect_timings(timings, memory) as collector:
+        start = time.perf_counter()
+        try:
+            tracks, settings = get_tracks(config, chrom, preview=preview)
+        except NoTrackDataError:
+            pass
+        else:
+            shared = SharedTracks.write(tracks, shared_dir)
+        read_time = time.perf_counter() - start
+    return shared, settings, read_time, collector.records if collector else None
+
+
+def draw_chrom_shared(
+    job: "tuple[str, SharedTracks, PlotSettings, float]",
+    outdir: str,
+    *,
+    xlim: tuple[int, int] | None = None,
+    template: bool = False,
+    merge_format: str | None = None,
+    timings: bool = False,
+    memory: bool = False,
+) -> DrawResult:
+    """
+    Plot the shared tracks of a single chrom from `read_chrom_shared`.
+    """
+    chrom, shared, settings, read_time = job
+    with collect_timings(timings, memory) as collector:
+        start = time.perf_counter()
+        tracks = shared.read()
+        if xlim:
+            settings.xlim = xlim
+        res = plot_chrom(
+            tracks,
+            settings,
+            chrom,
+            outdir,
+            read_time=read_time + time.perf_counter() - start,
+            template=template,
+            merge_format=merge_format,
         )
-    return inputs
+    return res._replace(timings=collector.records) if collector else res
+
+
+ESTIMATE_COLS = (
+    "chrom",
+    "track",
+    "rows",
+    "cached",
+    "artists",
+    "vertices",
+    "width",
+    "height",
+    "canvas_bytes",
+    "flags",
+)
+
+
+def write_estimates(
+    config: bytes, chroms: list[str] | None, output: TextIO, *, preview: bool = False
+) -> None:
+    """
+    Write the estimated cost of plotting each chrom and its tracks as a TSV without reading or drawing them. See `cenplot.estimate_tracks`.
+    * Each chrom has a row per track and a `total` row with its canvas size.
+    * Chroms likely to be slow or to exceed memory are flagged and logged.
+    """
+    from cenplot import estimate_tracks
+
+    # Without chroms, all tracks are plotted unfiltered.
+    all_chroms: list[str | None] = [*chroms] if chroms else [None]
+    output.write("\t".join(ESTIMATE_COLS) + "\n")
+    for chrom in all_chroms:
+        estimate = estimate_tracks(io.BytesIO(config), chrom=chrom, preview=preview)
+        name = chrom or "."
+        for trk in estimate.tracks:
+            row = [name, trk.track, trk.rows, trk.cached, trk.artists, trk.vertices]
+            output.write(
+                "\t".join(
+                    str(e) for e in (*row, "", "", "", "slow" if trk.slow else "")
+                )
+                + "\n"
+            )
+
+        flags = []
+        if estimate.slow:
+            flags.append("slow")
+            logging.warning(
+                f"{name} is likely to be slow to draw ({estimate.artists} artists, {estimate.vertices} vertices)."
+            )
+        if estimate.exceeds_memory:
+            flags.append("memory")
+            logging.warning(
+                f"{name} is likely to exceed memory ({estimate.width}x{estimate.height} pixel canvas of {estimate.canvas_bytes} bytes). Consider lowering dpi or setting max_tile_pixels."
+            )
+        row = [
+            name,
+            "total",
+            estimate.rows,
+            all(trk.cached for trk in estimate.tracks),
+            estimate.artists,
+            estimate.vertices,
+            estimate.width,
+            estimate.height,
+            estimate.canvas_bytes,
+            ",".join(flags),
+        ]
+        output.write("\t".join(str(e) for e in row) + "\n")
+
+
+def log_result(res: DrawResult) -> None:
+    logging.info(
+        f"Plotted {res.chrom} (read: {res.read_time:.2f}s, plot: {res.plot_time:.2f}s, size: {sum(res.sizes)} bytes)."
+    )
+
+
+def submit_bounded(
+    pool: Executor,
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    max_in_flight: int,
+) -> Iterator[tuple[int, T, Future[R]]]:
+    """
+    Submit items to a pool with at most `max_in_flight` jobs pending at once.
+    * Yields the index, item, and finished future of each job as it completes, not in submission order.
+    """
+    max_in_flight = max(1, max_in_flight)
+    pending: dict[Future[R], tuple[int, T]] = {}
+    items_iter = iter(enumerate(items))
+    while True:
+        for idx, item in items_iter:
+            pending[pool.submit(fn, item)] = (idx, item)
+            if len(pending) >= max_in_flight:
+                break
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            idx, item = pending.pop(future)
+            yield idx, item, future
 
 
 def add_draw_cli(parser: SubArgumentParser) -> None:
@@ -112,8 +478,68 @@ def add_draw_cli(parser: SubArgumentParser) -> None:
         type=str,
         default=None,
     )
+    ap.add_argument(
+        "--max_merged_pixels",
+        type=int,
+        default=None,
+        help="Split a merged png into numbered shards of at most this many pixels. ex. merged_1.png, merged_2.png",
+    )
     ap.add_argument("--share_xlim", help="Share x-axis limits.", action="store_true")
     ap.add_argument("-p", "--processes", type=int, default=4, help="Processes to run.")
+    ap.add_argument(
+        "--max_in_flight",
+        type=int,
+        default=None,
+        help="Max number of chroms submitted to processes at once. Defaults to twice the number of processes.",
+    )
+    ap.add_argument(
+        "--template",
+        action="store_true",
+        help="Build the figure once per process and reuse it across chroms with the same track layout.",
+    )
+    ap.add_argument(
+        "--preview",
+        action="store_true",
+        help="Draw fast, low resolution png previews with the same layout. See PlotSettings.preview.",
+    )
+    ap.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep tracks in memory and redraw chroms in this process whenever the config or the files of its tracks change.",
+    )
+    ap.add_argument(
+        "--watch_interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checking files for changes with --watch.",
+    )
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Skip chroms already drawn in the output dir with the same config, track files, options, and cenplot version. Drawn chroms are recorded in {MANIFEST_FILE} in the output dir.",
+    )
+    ap.add_argument(
+        "--timings",
+        type=argparse.FileType("wt"),
+        default=None,
+        help="Write the wall and CPU time of each chrom, track, and stage to this JSON file and print a summary. See cenplot.Timings.",
+    )
+    ap.add_argument(
+        "--memory",
+        action="store_true",
+        help="Sample the peak RSS of each chrom, track, and stage in each worker. Included in the --timings report and summary.",
+    )
+    ap.add_argument(
+        "--dry_run",
+        action="store_true",
+        help="Don't read or draw tracks. Instead, write a TSV to stdout of the estimated rows, artists, and vertices of each chrom and track and the canvas size from scans of the track files. Flags chroms likely to be slow or to exceed memory.",
+    )
+    ap.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help=f"Dir to cache slow to compute track data, like HOR array lengths and local self-identity, across runs. Defaults to the {CACHE_DIR_ENV} environment variable.",
+    )
 
     return None
 
@@ -125,44 +551,258 @@ def draw(
     outfile: str,
     share_xlim: bool,
     processes: int,
+    template: bool = False,
+    preview: bool = False,
+    max_merged_pixels: int | None = None,
+    max_in_flight: int | None = None,
+    watch: bool = False,
+    watch_interval: float = 1.0,
+    resume: bool = False,
+    timings: TextIO | None = None,
+    memory: bool = False,
+    dry_run: bool = False,
 ):
-    if chroms:
-        draw_args = get_draw_args(
-            input_tracks=input_tracks,
-            chroms=chroms,
-            share_xlim=share_xlim,
-            outdir=outdir,
-        )
-        os.makedirs(outdir, exist_ok=True)
-        if processes == 1:
-            plots = [plot_tracks(*draw_arg) for draw_arg in draw_args]
+    from cenplot import plot_tracks, merge_pdfs, merge_pngs, read_tracks
+
+    merge_format: str | None = None
+    if outfile and outfile.endswith(".pdf"):
+        if preview:
+            outfile = f"{os.path.splitext(outfile)[0]}.png"
+            logging.warning(f"Previews are only png. Merging into {outfile}.")
         else:
-            with ProcessPoolExecutor(
-                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
-            ) as pool:
-                futures = [
-                    (draw_arg[2], pool.submit(plot_tracks, *draw_arg))
-                    for draw_arg in draw_args
-                ]  # type: ignore[assignment]
-                plots = []
-                for chrom, future in futures:
-                    if future.exception():
-                        logging.error(f"Failed to plot {chrom} ({future.exception()})")
-                        continue
-                    plots.append(future.result())
+            # Each worker writes a pdf whose pages are concatenated.
+            merge_format = "pdf"
+
+    if watch:
+        from .watch import Watcher
 
-        if outfile:
-            logging.info(f"Merging {len(plots)} plots into {outfile}.")
-            merge_plots(plots, outfile)
-    else:
-        tracklist, settings = read_tracks(input_tracks)
         os.makedirs(outdir, exist_ok=True)
-        _, _, files = plot_tracks(
-            tracks=tracklist.tracks,
-            settings=settings,
-            outdir=outdir,
-        )
-        if outfile:
-            shutil.copy(files[0], outfile)
+        Watcher(
+            input_tracks.name,
+            chroms,
+            outdir,
+            outfile,
+            share_xlim=share_xlim,
+            preview=preview,
+            template=template,
+            merge_format=merge_format,
+            max_merged_pixels=max_merged_pixels,
+        ).run(watch_interval)
+        return None
+
+    if dry_run:
+        write_estimates(input_tracks.read(), chroms, sys.stdout, preview=preview)
+        return None
+
+    with collect_timings(timings is not None or memory, memory) as collector:
+        # Only pass the config contents to workers. Each reads its own tracks.
+        config = input_tracks.read()
+        if chroms:
+            draw_fn = partial(
+                draw_chrom,
+                config,
+                outdir=outdir,
+                preview=preview,
+                template=template,
+                merge_format=merge_format,
+                timings=collector is not None,
+                memory=memory,
+            )
+            os.makedirs(outdir, exist_ok=True)
+            # Statistics of chroms read in a previous run with the same cache dir.
+            chrom_stats = get_chrom_stats(config, chroms)
+            # Chroms read before without data are skipped without reading them again. Others are dropped once read.
+            empty_chroms = {
+                chrom
+                for chrom, stats in chrom_stats.items()
+                if stats and not stats.xlim
+            }
+            for chrom in empty_chroms:
+                logging.warning(f"Skipped {chrom}. No track has data.")
+            chroms = [chrom for chrom in chroms if chrom not in empty_chroms]
+            # Only kept if resuming so other runs leave the output dir as is.
+            manifest = RenderManifest(outdir) if resume else None
+            results_by_idx: dict[int, DrawResult] = {}
+            keys: dict[str, str] = {}
+            # x-axis limits of each chrom's own tracks.
+            chrom_xlims: dict[str, tuple[int, int] | None] = {}
+
+            def get_stale_chroms(manifest: RenderManifest) -> list[tuple[int, str]]:
+                # Reuse files of chroms drawn with the same config, files, and options.
+                config_digest = get_config_digest(config)
+                stale_chroms = []
+                for idx, chrom in enumerate(chroms):
+                    keys[chrom] = get_render_key(
+                        config_digest,
+                        chrom,
+                        # Shared limits only depend on the config, its files, and the chroms sharing them.
+                        share_xlim=chroms if share_xlim else None,
+                        preview=preview,
+                        merge_format=merge_format,
+                    )
+                    files = manifest.get_files(chrom, keys[chrom])
+                    chrom_xlim = manifest.get_xlim(chrom)
+                    # Limits of skipped chroms are still needed to share them with the others.
+                    if files is None or (share_xlim and not chrom_xlim):
+                        stale_chroms.append((idx, chrom))
+                        continue
+                    logging.info(f"Skipped {chrom}. Up to date with {files}.")
+                    chrom_xlims[chrom] = chrom_xlim
+                    results_by_idx[idx] = DrawResult(
+                        chrom,
+                        files,
+                        [os.path.getsize(file) for file in files],
+                        0.0,
+                        0.0,
+                    )
+                return stale_chroms
+
+            def add_result(idx: int, res: DrawResult) -> None:
+                if res.files:
+                    log_result(res)
+                else:
+                    logging.warning(f"Skipped {res.chrom}. No track has data.")
+                if collector and res.timings:
+                    collector.extend(res.timings)
+                results_by_idx[idx] = res
+                if manifest:
+                    manifest.add(
+                        res.chrom,
+                        keys[res.chrom],
+                        res.files,
+                        chrom_xlims.get(res.chrom),
+                    )
+
+            # Only stale chroms are read below.
+            stale_chroms = (
+                get_stale_chroms(manifest) if manifest else list(enumerate(chroms))
+            )
+            xlim = None
+            stale_stats = [chrom_stats[chrom] for _, chrom in stale_chroms]
+            if share_xlim and chroms and all(stale_stats):
+                logging.info("Sharing x-axis limits from cached track statistics.")
+                for (_, chrom), stats in zip(stale_chroms, stale_stats):
+                    chrom_xlims[chrom] = stats.xlim if stats else None
+                xlim = get_shared_xlim(chrom_xlims.values())
+
+            with ExitStack() as stack:
+                shared_dir = stack.enter_context(
+                    tempfile.TemporaryDirectory(prefix="cenplot_shared_")
+                )
+                pool = (
+                    stack.enter_context(
+                        ProcessPoolExecutor(
+                            max_workers=processes,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    )
+                    if processes > 1
+                    else None
+                )
+                fn: Callable[[Any], DrawResult] = partial(draw_fn, xlim=xlim)
+                jobs: dict[str, Any] = {chrom: chrom for _, chrom in stale_chroms}
+                if share_xlim and not xlim:
+                    # Tracks are read once to get their limits. Plotting them memory-maps the data rather than reading it again.
+                    read_fn = partial(
+                        read_chrom_shared,
+                        config,
+                        shared_dir=shared_dir,
+                        preview=preview,
+                        timings=collector is not None,
+                        memory=memory,
+                    )
+                    stale_names = [chrom for _, chrom in stale_chroms]
+                    shared = (
+                        pool.map(read_fn, stale_names)
+                        if pool
+                        else map(read_fn, stale_names)
+                    )
+                    for (idx, chrom), (
+                        shared_tracks,
+                        settings,
+                        read_time,
+                        records,
+                    ) in zip(stale_chroms, shared):
+                        if collector and records:
+                            collector.extend(records)
+                        if shared_tracks is None or settings is None:
+                            del jobs[chrom]
+                            add_result(idx, DrawResult(chrom, [], [], read_time, 0.0))
+                            continue
+                        chrom_xlims[chrom] = settings.xlim
+                        jobs[chrom] = (chrom, shared_tracks, settings, read_time)
+                    stale_chroms = [
+                        (idx, chrom) for idx, chrom in stale_chroms if chrom in jobs
+                    ]
+                    xlim = get_shared_xlim(chrom_xlims.values())
+                    fn = partial(
+                        draw_chrom_shared,
+                        outdir=outdir,
+                        xlim=xlim,
+                        template=template,
+                        merge_format=merge_format,
+                        timings=collector is not None,
+                        memory=memory,
+                    )
+
+                if not pool:
+                    for idx, chrom in stale_chroms:
+                        add_result(idx, fn(jobs[chrom]))
+                else:
+                    for i, _, future in submit_bounded(
+                        pool,
+                        fn,
+                        [jobs[chrom] for _, chrom in stale_chroms],
+                        max_in_flight or 2 * processes,
+                    ):
+                        idx, chrom = stale_chroms[i]
+                        if future.exception():
+                            logging.error(
+                                f"Failed to plot {chrom} ({future.exception()})"
+                            )
+                            continue
+                        add_result(idx, future.result())
+
+            if manifest:
+                manifest.compact()
+            # Merge in the given order.
+            results = [results_by_idx[idx] for idx in sorted(results_by_idx)]
+
+            merge_ext = ".pdf" if merge_format == "pdf" else ".png"
+            merge_files = [
+                file
+                for res in results
+                for file in res.files
+                if file.endswith(merge_ext)
+            ]
+            if outfile and not merge_files:
+                logging.warning(f"No plots to merge into {outfile}.")
+            elif outfile:
+                logging.info(f"Merging {len(results)} plots into {outfile}.")
+                with timed("merge"):
+                    if merge_format == "pdf":
+                        merged_files = merge_pdfs(merge_files, outfile)
+                    else:
+                        merged_files = merge_pngs(
+                            merge_files, outfile, max_pixels=max_merged_pixels
+                        )
+                logging.info(f"Wrote merged plots to {merged_files}.")
+        else:
+            tracklist, settings = read_tracks(input_tracks)
+            if preview:
+                settings.preview = True
+            os.makedirs(outdir, exist_ok=True)
+            _, _, files = plot_tracks(
+                tracks=tracklist.tracks,
+                settings=settings,
+                outdir=outdir,
+            )
+            if outfile:
+                shutil.copy(files[0], outfile)
+
+    if collector:
+        if timings:
+            collector.write_json(timings)
+        logging.info(collector.summary())
 
     logging.info("Done!")
@@ -0,0 +1,152 @@
+import io
+import os
+import json
+import hashlib
+import logging
+
+from typing import Any
+from importlib.metadata import version, PackageNotFoundError
+
+# Manifest of rendered files in the output dir.
+MANIFEST_FILE = ".cenplot_manifest.jsonl"
+
+
+def get_cenplot_version() -> str:
+    try:
+        return version("cenplot")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_config_digest(config: bytes) -> str:
+    """
+    Hash the contents of a TOML or YAML config, the size and modification time of every file used by its tracks, and the cenplot version.
+    * The parsed config is hashed so formatting and comments are ignored.
+    """
+    from cenplot.lib.io.tracks import load_config, get_track_files
+
+    dict_settings = load_config(io.BytesIO(config))
+    files = []
+    for track in dict_settings.get("tracks", []):
+        if not isinstance(track, dict):
+            continue
+        for file in get_track_files(track):
+            stat = os.stat(file)
+            files.append((os.path.abspath(file), stat.st_size, stat.st_mtime_ns))
+
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "config": dict_settings,
+                "files": files,
+                "version": get_cenplot_version(),
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def get_render_key(config_digest: str, chrom: str, **options: Any) -> str:
+    """
+    Hash of everything that determines the output of a chrom.
+
+    # Args
+    * `config_digest`
+        * Digest of config from `get_config_digest`.
+    * `chrom`
+        * Chrom name.
+    * `options`
+        * Other options that change the output. ex. `xlim`
+
+    # Returns
+    * Key as a hex string.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {"config": config_digest, "chrom": chrom, "options": options},
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+class RenderManifest:
+    """
+    Manifest of the files drawn for each chrom in an output dir and the key they were drawn with. See `get_render_key`.
+
+    Entries are appended to a JSON lines file as each chrom is drawn so it's kept up to date if a run is interrupted.
+    """
+
+    def __init__(self, outdir: str) -> None:
+        self.path = os.path.join(outdir, MANIFEST_FILE)
+        self._entries: dict[str, dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rt") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["chrom"]] = entry
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # Partially written line from an interrupted run.
+                    continue
+
+    def get_files(self, chrom: str, key: str) -> list[str] | None:
+        """
+        Get the files of a chrom if drawn with the same key and unchanged since.
+
+        # Returns
+        * Files or `None` if the chrom must be drawn.
+        """
+        entry = self._entries.get(chrom)
+        if not entry or entry.get("key") != key:
+            return None
+        files: list[str] = entry["files"]
+        sizes: list[int] = entry["sizes"]
+        for file, size in zip(files, sizes):
+            if not os.path.exists(file) or os.path.getsize(file) != size:
+                return None
+        return files
+
+    def get_xlim(self, chrom: str) -> tuple[int, int] | None:
+        """
+        Get the x-axis limits of a chrom's own tracks recorded when it was drawn. `None` if not recorded.
+        """
+        entry = self._entries.get(chrom)
+        xlim = entry.get("xlim") if entry else None
+        return (xlim[0], xlim[1]) if xlim else None
+
+    def add(
+        self,
+        chrom: str,
+        key: str,
+        files: list[str],
+        xlim: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Record the files drawn for a chrom.
+        * `xlim` is the x-axis limits of the chrom's own tracks, so limits can be shared without reading them again.
+        """
+        entry = {
+            "chrom": chrom,
+            "key": key,
+            "files": files,
+            "sizes": [os.path.getsize(file) for file in files],
+            "xlim": xlim,
+        }
+        self._entries[chrom] = entry
+        with open(self.path, "at") as fh:
+            fh.write(json.dumps(entry) + "\n")
+
+    def compact(self) -> None:
+        """
+        Rewrite the manifest with only the latest entry of each chrom.
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wt") as fh:
+            for entry in self._entries.values():
+                fh.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+        logging.debug(f"Wrote {len(self._entries)} entries to {self.path}.")
@@ -0,0 +1,348 @@
+import io
+import os
+import copy
+import json
+import time
+import uuid
+import shutil
+import logging
+import argparse
+import tempfile
+import dataclasses
+import multiprocessing
+
+from collections import OrderedDict
+from typing import Any, NamedTuple, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..lib.defaults import CACHE_DIR_ENV
+from .draw import DrawResult, get_tracks, set_rc_params
+
+if TYPE_CHECKING:
+    from cenplot import FigureTemplate, PlotSettings, Track
+
+    SubArgumentParser = argparse._SubParsersAction[argparse.ArgumentParser]
+else:
+    SubArgumentParser = Any
+
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "pdf": "application/pdf",
+    "svg": "image/svg+xml",
+}
+# Fields of PlotSettings that are tuples.
+TUPLE_SETTINGS = ("dim", "xlim")
+
+# Parsed tracks of this worker by config, data files, and chrom.
+_TRACK_CACHE: "OrderedDict[tuple, tuple[list[Track], PlotSettings]]" = OrderedDict()
+_TRACK_CACHE_SIZE = 16
+# Figure template of this worker.
+_TEMPLATE: "FigureTemplate | None" = None
+
+
+class RenderJob(NamedTuple):
+    """
+    Render request sent to a worker.
+    """
+
+    config: str
+    chrom: str
+    outdir: str
+    overrides: dict[str, Any]
+    template: bool
+
+
+def init_worker(cache_size: int) -> None:
+    """
+    Set the track cache size of a worker and import plotting dependencies before the first job.
+    """
+    global _TRACK_CACHE_SIZE
+    _TRACK_CACHE_SIZE = cache_size
+    set_rc_params()
+    import cenplot.lib.draw  # noqa: F401
+    import cenplot.lib.io  # noqa: F401
+
+
+def get_data_files(config: bytes) -> list[str]:
+    """
+    Get the files used by each track in a TOML or YAML config.
+    """
+    from cenplot.lib.io.tracks import load_config, get_track_files
+
+    return [
+        file
+        for track in load_config(io.BytesIO(config)).get("tracks", [])
+        if isinstance(track, dict)
+        for file in get_track_files(track)
+    ]
+
+
+def get_tracks_cached(config: bytes, chrom: str) -> "tuple[list[Track], PlotSettings]":
+    """
+    Get the tracks of a chrom, reusing those previously read by this worker.
+    * Tracks are read again if the config or the modification time of any of its data files changes.
+    * Copies are returned as plotting modifies tracks.
+    """
+    data_files = get_data_files(config)
+    key = (
+        config,
+        chrom,
+        tuple(
+            (file, os.stat(file).st_mtime_ns if os.path.exists(file) else None)
+            for file in data_files
+        ),
+    )
+    if key in _TRACK_CACHE:
+        _TRACK_CACHE.move_to_end(key)
+    else:
+        _TRACK_CACHE[key] = get_tracks(config, chrom)
+        while len(_TRACK_CACHE) > max(_TRACK_CACHE_SIZE, 1):
+            _TRACK_CACHE.popitem(last=False)
+
+    tracks, settings = _TRACK_CACHE[key]
+    return (
+        [
+            dataclasses.replace(track, options=copy.copy(track.options))
+            for track in tracks
+        ],
+        dataclasses.replace(settings),
+    )
+
+
+def render_job(job: RenderJob) -> DrawResult:
+    """
+    Render a single job. Run in each worker.
+    """
+    from cenplot import plot_tracks, FigureTemplate
+
+    global _TEMPLATE
+    with open(job.config, "rb") as fh:
+        config = fh.read()
+
+    start = time.perf_counter()
+    tracks, settings = get_tracks_cached(config, job.chrom)
+    read_time = time.perf_counter() - start
+
+    overrides: dict[str, Any] = {
+        key: tuple(value) if key in TUPLE_SETTINGS and value else value
+        for key, value in job.overrides.items()
+    }
+    settings = dataclasses.replace(settings, **overrides)
+
+    start = time.perf_counter()
+    if job.template:
+        if _TEMPLATE is None:
+            _TEMPLATE = FigureTemplate()
+        _, _, files = plot_tracks(
+            tracks, settings, job.outdir, job.chrom, template=_TEMPLATE
+        )
+    else:
+        _, _, files = plot_tracks(tracks, settings, job.outdir, job.chrom, release=True)
+    plot_time = time.perf_counter() - start
+
+    return DrawResult(
+        job.chrom,
+        files,
+        [os.path.getsize(file) for file in files],
+        read_time,
+        plot_time,
+    )
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    HTTP server rendering jobs with a pool of warm worker processes.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        pool: ProcessPoolExecutor,
+        outdir: str,
+        template: bool,
+    ) -> None:
+        super().__init__(address, RenderHandler)
+        self.pool = pool
+        self.outdir = outdir
+        self.template = template
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """
+    Handle render requests.
+    * `GET /health`
+        * Returns `{"status": "ok"}`.
+    * `POST /render`
+        * JSON body with the fields:
+            * `config`: Path to a TOML or YAML config.
+            * `chrom`: Region to plot.
+            * `overrides`: Optional `PlotSettings` fields to override. ex. `{"dpi": 150, "xlim": [0, 100000]}`
+            * `format`: Optional output format. Either `png`, `pdf`, or `svg`. Defaults to `png`.
+            * `return`: Optional. Either `bytes` to return the file or `path` to return the paths of the output files as JSON. Defaults to `bytes`.
+    """
+
+    server: RenderServer
+
+    def send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.info(f"{self.address_string()} {format % args}")
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self.send_json(HTTPStatus.OK, {"status": "ok"})
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Not found ({self.path})"})
+
+    def do_POST(self) -> None:
+        from cenplot import PlotSettings
+
+        if self.path != "/render":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Not found ({self.path})"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            config = os.path.abspath(request["config"])
+            chrom = str(request["chrom"])
+            fmt = request.get("format", "png")
+            return_type = request.get("return", "bytes")
+            overrides = dict(request.get("overrides", {}))
+            if fmt not in CONTENT_TYPES:
+                raise ValueError(f"Invalid format ({fmt}).")
+            if return_type not in ("bytes", "path"):
+                raise ValueError(f"Invalid return type ({return_type}).")
+            invalid_fields = set(overrides) - set(
+                field.name for field in dataclasses.fields(PlotSettings)
+            )
+            if invalid_fields:
+                raise ValueError(f"Invalid settings ({sorted(invalid_fields)}).")
+        except (ValueError, KeyError, TypeError) as err:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": repr(err)})
+            return
+
+        if overrides.get("preview"):
+            # Previews are only png.
+            fmt = "png"
+        overrides["format"] = fmt
+        # Each job has its own dir so jobs of the same chrom don't overwrite each other.
+        outdir = os.path.join(self.server.outdir, uuid.uuid4().hex)
+        os.makedirs(outdir)
+        job = RenderJob(config, chrom, outdir, overrides, self.server.template)
+        try:
+            res: DrawResult = self.server.pool.submit(render_job, job).result()
+        except Exception as err:
+            shutil.rmtree(outdir, ignore_errors=True)
+            logging.error(f"Failed to render {chrom} of {config} ({err})")
+            self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(err)})
+            return
+
+        logging.info(
+            f"Rendered {res.chrom} (read: {res.read_time:.2f}s, plot: {res.plot_time:.2f}s, size: {sum(res.sizes)} bytes)."
+        )
+        if return_type == "path":
+            self.send_json(
+                HTTPStatus.OK,
+                {
+                    "chrom": res.chrom,
+                    "files": res.files,
+                    "read_time": res.read_time,
+                    "plot_time": res.plot_time,
+                },
+            )
+            return
+
+        outfile = next(file for file in res.files if file.endswith(f".{fmt}"))
+        with open(outfile, "rb") as fh:
+            data = fh.read()
+        shutil.rmtree(outdir, ignore_errors=True)
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[fmt])
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def add_serve_cli(parser: SubArgumentParser) -> None:
+    ap = parser.add_parser(
+        "serve",
+        description="Serve render requests over localhost HTTP with warm worker processes. See cenplot.cli.serve.RenderHandler for the API.",
+    )
+    ap.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind.")
+    ap.add_argument("--port", type=int, default=8765, help="Port to bind.")
+    ap.add_argument(
+        "-d",
+        "--outdir",
+        type=str,
+        default=None,
+        help="Output dir of rendered files. Defaults to a temporary dir removed on exit.",
+    )
+    ap.add_argument("-p", "--processes", type=int, default=4, help="Processes to run.")
+    ap.add_argument(
+        "--cache_size",
+        type=int,
+        default=16,
+        help="Number of parsed configs and chroms kept in memory by each process.",
+    )
+    ap.add_argument(
+        "--template",
+        action="store_true",
+        help="Build the figure once per process and reuse it across jobs with the same track layout.",
+    )
+    ap.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help=f"Dir to cache slow to compute track data, like HOR array lengths and local self-identity, across runs. Defaults to the {CACHE_DIR_ENV} environment variable.",
+    )
+    return None
+
+
+def serve(
+    host: str,
+    port: int,
+    outdir: str | None,
+    processes: int,
+    cache_size: int = 16,
+    template: bool = False,
+) -> int:
+    tmp_dir = None
+    if outdir is None:
+        tmp_dir = tempfile.mkdtemp(prefix="cenplot_serve_")
+        outdir = tmp_dir
+    os.makedirs(outdir, exist_ok=True)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(cache_size,),
+        ) as pool:
+            # Start workers now rather than on the first request.
+            for future in [pool.submit(time.sleep, 0) for _ in range(processes)]:
+                future.result()
+
+            with RenderServer((host, port), pool, outdir, template) as server:
+                logging.info(f"Serving on http://{host}:{server.server_port}")
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    logging.info("Stopping server.")
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return 0
@@ -0,0 +1,237 @@
+import os
+import copy
+import time
+import shutil
+import logging
+import dataclasses
+
+from typing import TYPE_CHECKING
+
+from .draw import add_format, get_shared_xlim, get_tracks
+
+if TYPE_CHECKING:
+    import polars as pl
+    from cenplot import PlotSettings, Track
+
+
+def get_watched_files(config_path: str) -> list[str]:
+    """
+    Get the config and every file used by its tracks.
+    """
+    from cenplot.lib.io.tracks import load_config, get_track_files
+
+    files = {config_path}
+    try:
+        with open(config_path, "rb") as fh:
+            tracks = load_config(fh).get("tracks", [])
+    except Exception:
+        # Invalid config while being edited. Only watch the config.
+        return [config_path]
+
+    for track in tracks:
+        if isinstance(track, dict):
+            files.update(get_track_files(track))
+    return sorted(files)
+
+
+def get_file_state(files: list[str]) -> dict[str, tuple[int, int] | None]:
+    """
+    Get the modification time and size of files. `None` if a file doesn't exist.
+    """
+    state: dict[str, tuple[int, int] | None] = {}
+    for file in files:
+        try:
+            stat = os.stat(file)
+            state[file] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            state[file] = None
+    return state
+
+
+def get_visible_data(track: "Track", xlim: tuple[int, int] | None) -> "pl.DataFrame":
+    """
+    Get the data of a track overlapping the x-axis limits.
+    * Intervals outside of a region are clipped to zero length at its ends so are also excluded.
+    """
+    import polars as pl
+
+    if not xlim or not {"chrom_st", "chrom_end"}.issubset(track.data.columns):
+        return track.data
+    xmin, xmax = xlim
+    return track.data.filter(
+        (pl.col("chrom_end") >= xmin)
+        & (pl.col("chrom_st") <= xmax)
+        & (pl.col("chrom_end") > pl.col("chrom_st"))
+    )
+
+
+def tracks_equal(
+    tracks: "list[Track]",
+    other_tracks: "list[Track]",
+    xlim: tuple[int, int] | None = None,
+) -> bool:
+    """
+    Check if two lists of tracks would be drawn the same.
+    * Only data overlapping `xlim` is compared.
+    """
+    return len(tracks) == len(other_tracks) and all(
+        trk.title == other.title
+        and trk.pos == other.pos
+        and trk.opt == other.opt
+        and trk.prop == other.prop
+        and trk.options == other.options
+        and get_visible_data(trk, xlim).equals(get_visible_data(other, xlim))
+        for trk, other in zip(tracks, other_tracks)
+    )
+
+
+def copy_tracks(tracks: "list[Track]") -> "list[Track]":
+    # Plotting modifies tracks.
+    return [dataclasses.replace(trk, options=copy.copy(trk.options)) for trk in tracks]
+
+
+class Watcher:
+    """
+    Redraw chroms when the config or the files of its tracks change.
+    * Tracks are kept in memory and only those whose settings or files changed are read again. See `cenplot.TrackCache`.
+    * Only chroms whose tracks or settings changed are redrawn.
+    """
+
+    def __init__(
+        self,
+        config_path: str,
+        chroms: list[str] | None,
+        outdir: str,
+        outfile: str | None,
+        *,
+        share_xlim: bool = False,
+        preview: bool = False,
+        template: bool = False,
+        merge_format: str | None = None,
+        max_merged_pixels: int | None = None,
+    ) -> None:
+        from cenplot import FigureTemplate, TrackCache
+
+        self.config_path = config_path
+        self.chroms = chroms
+        self.outdir = outdir
+        self.outfile = outfile
+        self.share_xlim = share_xlim
+        self.preview = preview
+        self.merge_format = merge_format
+        self.max_merged_pixels = max_merged_pixels
+        self.track_cache: TrackCache = TrackCache()
+        self.template: FigureTemplate | None = FigureTemplate() if template else None
+        # Tracks, settings, and output files of the last drawn plot of each chrom.
+        self._drawn: dict[str | None, tuple[list[Track], PlotSettings, list[str]]] = {}
+
+    def read(self) -> "dict[str | None, tuple[list[Track], PlotSettings]]":
+        from cenplot import read_tracks
+
+        with open(self.config_path, "rb") as fh:
+            config = fh.read()
+
+        plots: dict[str | None, tuple[list[Track], PlotSettings]] = {}
+        if self.chroms:
+            for chrom in self.chroms:
+                plots[chrom] = get_tracks(
+                    config, chrom, preview=self.preview, track_cache=self.track_cache
+                )
+        else:
+            with open(self.config_path, "rb") as fh:
+                tracklist, settings = read_tracks(fh, track_cache=self.track_cache)
+            if self.preview:
+                settings.preview = True
+            plots[None] = (tracklist.tracks, settings)
+        self.track_cache.prune()
+
+        if self.share_xlim:
+            xlim = get_shared_xlim(settings.xlim for _, settings in plots.values())
+            for _, settings in plots.values():
+                settings.xlim = xlim
+        if self.merge_format:
+            for _, settings in plots.values():
+                add_format(settings, self.merge_format)
+        return plots
+
+    def draw(self) -> int:
+        """
+        Read tracks and draw chroms that changed since the last draw.
+
+        # Returns
+        * Number of chroms drawn.
+        """
+        from cenplot import plot_tracks, merge_pdfs, merge_pngs
+
+        n_drawn = 0
+        for chrom, (tracks, settings) in self.read().items():
+            drawn = self._drawn.get(chrom)
+            if (
+                drawn
+                and drawn[1] == settings
+                and tracks_equal(drawn[0], tracks, settings.xlim)
+                and all(os.path.exists(file) for file in drawn[2])
+            ):
+                continue
+
+            start = time.perf_counter()
+            _, _, files = plot_tracks(
+                copy_tracks(tracks),
+                dataclasses.replace(settings),
+                self.outdir,
+                chrom,
+                template=self.template,
+                release=self.template is None,
+            )
+            logging.info(
+                f"Plotted {chrom} (plot: {time.perf_counter() - start:.2f}s, files: {files})."
+            )
+            self._drawn[chrom] = (tracks, settings, files)
+            n_drawn += 1
+
+        if not n_drawn or not self.outfile:
+            return n_drawn
+
+        files = [file for _, _, files in self._drawn.values() for file in files]
+        if not self.chroms:
+            shutil.copy(files[0], self.outfile)
+            merged_files = [self.outfile]
+        elif self.merge_format == "pdf":
+            merged_files = merge_pdfs(
+                [file for file in files if file.endswith(".pdf")], self.outfile
+            )
+        else:
+            merged_files = merge_pngs(
+                [file for file in files if file.endswith(".png")],
+                self.outfile,
+                max_pixels=self.max_merged_pixels,
+            )
+        logging.info(f"Wrote merged plots to {merged_files}.")
+        return n_drawn
+
+    def run(self, interval: float = 1.0) -> None:
+        """
+        Draw all chroms and then redraw changed chroms whenever the config or its files change. Stops on `KeyboardInterrupt`.
+
+        # Args
+        * `interval`
+            * Seconds between checking files for changes.
+        """
+        state: dict[str, tuple[int, int] | None] = {}
+        try:
+            while True:
+                files = get_watched_files(self.config_path)
+                new_state = get_file_state(files)
+                if new_state != state:
+                    state = new_state
+                    try:
+                        n_drawn = self.draw()
+                        logging.info(
+                            f"Redrew {n_drawn} chroms. Watching {len(files)} files for changes."
+                        )
+                    except Exception as err:
+                        # Keep watching so the error can be fixed.
+                        logging.error(f"Failed to draw ({err!r}). Waiting for changes.")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logging.info("Stopped watching.")
@@ -91,3 +91,6 @@ IDENT_RANGE = [
 
 Colorscale = dict[tuple[float, float], str]
 IDENT_COLORSCALE: Colorscale = dict(zip(IDENT_RANGE, IDENT_COLORS))
+
+# Environment variable with the dir of cached derived track data.
+CACHE_DIR_ENV = "CENPLOT_CACHE_DIR"
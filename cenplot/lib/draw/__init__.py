@@ -10,9 +10,11 @@ from .self_ident import draw_self_ident, draw_self_ident_hist
 from .local_self_ident import draw_local_self_ident
 from .line import draw_line
 from .bar import draw_bar
-from .utils import merge_plots
+from .utils import merge_plots, merge_pngs
+from .pdf import merge_pdfs
 from .legend import draw_legend
 from .settings import PlotSettings
+from .template import FigureTemplate
 
 __all__ = [
     "plot_tracks",
@@ -27,5 +29,8 @@ __all__ = [
     "draw_line",
     "draw_legend",
     "merge_plots",
+    "merge_pngs",
+    "merge_pdfs",
     "PlotSettings",
+    "FigureTemplate",
 ]
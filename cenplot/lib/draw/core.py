@@ -4,6 +4,7 @@ import numpy as np
 
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 
 from .settings import PlotSettings
@@ -15,8 +16,11 @@ from .line import draw_line
 from .bar import draw_bar
 from .legend import draw_legend
 from .local_self_ident import draw_local_self_ident
-from .utils import create_subplots, format_ax, set_both_labels
+from .preview import decimate_tracks, get_preview_settings
+from .template import FigureTemplate
+from .utils import create_subplots, format_ax, save_figure, set_both_labels
 from ..io.utils import get_min_max_track
+from ..timing import timed
 from ..track.types import Track, TrackType, TrackPosition, LegendPosition
 
 
@@ -25,6 +29,8 @@ def plot_tracks(
     settings: PlotSettings,
     outdir: str | None = None,
     chrom: str | None = None,
+    template: FigureTemplate | None = None,
+    release: bool = False,
 ) -> tuple[Figure, np.ndarray, list[str]]:
     """
     Plot a single centromere figure from a list of `Track`s.
@@ -40,6 +46,12 @@ def plot_tracks(
     * `chrom`
         * Chromosome label. Replaces {chrom} format string in title if provided and sets output filenames.
         * If not provided, defaults to "out".
+    * `template`
+        * Reuse the figure and axes of a `cenplot.FigureTemplate` rather than building a new figure.
+        * Useful when plotting many chroms with the same track layout.
+    * `release`
+        * Clear the figure once written to `outdir` to free its memory. The returned figure and axes will be empty.
+        * Ignored if no `outdir` or if using a `template`.
 
     # Returns
     * Figure, its axes, and the output filename(s).
@@ -56,6 +68,9 @@ def plot_tracks(
     # Show chrom trimmed of spaces for logs and filenames.
     logging.info(f"Plotting {len(tracks)} tracks.")
 
+    if settings.preview:
+        settings = get_preview_settings(settings)
+
     if not settings.xlim:
         # Get min and max position of all tracks for this cen.
         _, min_st_pos = get_min_max_track(tracks, typ="min")
@@ -64,14 +79,20 @@ def plot_tracks(
         min_st_pos = settings.xlim[0]
         max_end_pos = settings.xlim[1]
 
+    if settings.preview:
+        tracks = decimate_tracks(tracks, settings, min_st_pos, max_end_pos)
+
     # # Scale height based on track length.
     # adj_height = height * (trk_max_end / max_end_pos)
     # height = height if adj_height == 0 else adj_height
 
-    fig, axes, track_indices = create_subplots(
-        tracks,
-        settings,
-    )
+    if template:
+        fig, axes, track_indices = template.subplots(tracks, settings)
+    else:
+        fig, axes, track_indices = create_subplots(
+            tracks,
+            settings,
+        )
     if settings.legend_pos == LegendPosition.Left:
         track_col, legend_col = 1, 0
     else:
@@ -134,8 +155,10 @@ def plot_tracks(
                 num_hor_split += 1
 
             # Minimalize all legend cols except self-ident
+            # Previews skip drawing the self-ident histogram.
             if track.opt != TrackType.SelfIdent or (
-                track.opt == TrackType.SelfIdent and not track.options.legend
+                track.opt == TrackType.SelfIdent
+                and (not track.options.legend or settings.preview)
             ):
                 format_ax(
                     legend_ax,
@@ -199,12 +222,16 @@ def plot_tracks(
             else:
                 raise ValueError("Invalid TrackType. Unreachable.")
 
-            draw_fn(
-                ax=track_ax,
-                legend_ax=legend_ax,
-                track=track,
-                zorder=idx,
-            )
+            if settings.preview and track.opt == TrackType.SelfIdent:
+                legend_ax = None
+
+            with timed("draw", chrom=chrom, track=f"{idx}:{track.opt}"):
+                draw_fn(
+                    ax=track_ax,
+                    legend_ax=legend_ax,
+                    track=track,
+                    zorder=idx,
+                )
 
     # Draw after all elements added.
     for ax, track_legend in legend_tracks:
@@ -216,17 +243,22 @@ def plot_tracks(
             title = settings.title.format(chrom=chrom)
         else:
             title = settings.title
+        title_y = settings.title_y
+        if title_y is None and template and template.title_y is not None:
+            title_y = template.title_y
         fig.suptitle(
             title,
             x=settings.title_x,
-            y=settings.title_y,
+            y=title_y,
             horizontalalignment=settings.title_horizontalalignment,
             fontsize=settings.title_fontsize,
         )
     # Pad between axes.
-    fig.set_layout_engine(layout=settings.layout, h_pad=settings.axis_h_pad)
+    # Layout of a template is only solved once.
+    if not template or not template.layout_solved:
+        fig.set_layout_engine(layout=settings.layout, h_pad=settings.axis_h_pad)
 
-    outfiles = []
+    outfiles: list[str] = []
 
     if outdir:
         os.makedirs(outdir, exist_ok=True)
@@ -235,25 +267,22 @@ def plot_tracks(
         else:
             output_format = settings.format
 
-        # PNG must always be plotted last.
-        # Matplotlib modifies figure settings causing formatting errors in vectorized image formats (svg, pdf)
-        png_output = "png" in output_format
-        if png_output:
-            output_format.remove("png")
-
         fname = chrom if chrom else "out"
-        for fmt in output_format:
-            outfile = os.path.join(outdir, f"{fname}.{fmt}")
-            fig.savefig(outfile, dpi=settings.dpi, transparent=settings.transparent)
-            outfiles.append(outfile)
-
-        if png_output:
-            outfile = os.path.join(outdir, f"{fname}.png")
-            fig.savefig(
-                outfile,
+        with timed("save", chrom=chrom):
+            outfiles = save_figure(
+                fig,
+                os.path.join(outdir, fname),
+                output_format,
                 dpi=settings.dpi,
                 transparent=settings.transparent,
+                max_tile_pixels=settings.max_tile_pixels,
             )
-            outfiles.append(outfile)
+
+        if template:
+            template.finalize(fig)
+        elif release:
+            fig.clear()
+            # Drop the canvas and its cached renderer buffer.
+            FigureCanvasAgg(fig)
 
     return fig, axes, outfiles
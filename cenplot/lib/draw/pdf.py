@@ -0,0 +1,35 @@
+from pypdf import PdfReader, PdfWriter
+
+
+def merge_pdfs(infiles: list[str], outfile: str) -> list[str]:
+    """
+    Merge PDF files by concatenating their pages without re-rendering them.
+    * Identical objects across files, like embedded font glyphs, are only written once.
+    * The document info of the first file is kept.
+    Raises a `ValueError` if there are no input files.
+
+    # Args
+    * `infiles`
+        * Input PDF files.
+    * `outfile`
+        * Output merged PDF file.
+
+    # Returns
+    * Output merged file(s).
+    """
+    if not infiles:
+        raise ValueError("No pdf files to merge.")
+
+    writer = PdfWriter()
+    for i, infile in enumerate(infiles):
+        reader = PdfReader(infile)
+        if i == 0 and reader.metadata:
+            writer.add_metadata(reader.metadata)
+        for page in reader.pages:
+            writer.add_page(page)
+
+    writer.compress_identical_objects()
+    with open(outfile, "wb") as fh:
+        writer.write(fh)
+
+    return [outfile]
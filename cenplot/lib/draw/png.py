@@ -0,0 +1,270 @@
+import io
+import math
+import zlib
+import struct
+import numpy as np
+
+from typing import BinaryIO, Self
+from types import TracebackType
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# 8-bit RGBA
+PNG_BIT_DEPTH = 8
+PNG_COLOR_TYPE_RGBA = 6
+PNG_CHANNELS = 4
+PNG_FILTER_UP = 2
+# Transparent white.
+PNG_PAD = (255, 255, 255, 0)
+# Max bytes of rows filtered and compressed at once.
+PNG_CHUNK_BYTES = 1 << 24
+# Extra rows rendered above and below each strip, in inches, so paths aren't cut within the rows kept.
+PNG_TILE_OVERLAP = 1 / 12
+
+
+def read_png_size(infile: str) -> tuple[int, int]:
+    """
+    Read the dimensions of a PNG file from its header without decoding it.
+
+    # Args
+    * `infile`
+        * Input PNG file.
+
+    # Returns
+    * Width and height in pixels.
+    """
+    with open(infile, "rb") as fh:
+        header = fh.read(24)
+    if header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        raise ValueError(f"Not a PNG file ({infile}).")
+    width, height = struct.unpack(">II", header[16:24])
+    return width, height
+
+
+class PNGWriter:
+    """
+    Streaming 8-bit RGBA PNG encoder.
+
+    Rows are compressed and written as they're added so only the rows passed to `PNGWriter.write_rows` are held in memory.
+
+    # Usage
+    ```python
+    with PNGWriter("out.png", width, height, dpi=600) as writer:
+        for rows in strips:
+            writer.write_rows(rows)
+    ```
+    """
+
+    def __init__(
+        self,
+        outfile: str | BinaryIO,
+        width: int,
+        height: int,
+        *,
+        dpi: float | None = None,
+        compresslevel: int = 6,
+    ) -> None:
+        """
+        # Args
+        * `outfile`
+            * Output file or binary IO stream.
+        * `width`
+            * Image width in pixels.
+        * `height`
+            * Image height in pixels.
+        * `dpi`
+            * Image DPI stored in the `pHYs` chunk.
+        * `compresslevel`
+            * `zlib` compression level.
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid PNG dimensions ({width}x{height}).")
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._closed = False
+        self._own_fh = isinstance(outfile, str)
+        self._fh: BinaryIO = (
+            open(outfile, "wb") if isinstance(outfile, str) else outfile
+        )
+        self._compressor = zlib.compressobj(compresslevel)
+        # Row above the first row is all zeros.
+        self._prev_row = np.zeros(width * PNG_CHANNELS, np.uint8)
+
+        self._fh.write(PNG_SIGNATURE)
+        self._write_chunk(
+            b"IHDR",
+            struct.pack(
+                ">IIBBBBB",
+                width,
+                height,
+                PNG_BIT_DEPTH,
+                PNG_COLOR_TYPE_RGBA,
+                # Compression, filter, and interlace methods.
+                0,
+                0,
+                0,
+            ),
+        )
+        if dpi:
+            # Pixels per meter.
+            ppm = round(dpi / 0.0254)
+            self._write_chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._fh.write(struct.pack(">I", len(data)))
+        self._fh.write(chunk_type)
+        self._fh.write(data)
+        self._fh.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """
+        Add rows to the image.
+
+        # Args
+        * `rows`
+            * `uint8` array of shape `(n, width, 4)`.
+        """
+        if (
+            rows.dtype != np.uint8
+            or rows.ndim != 3
+            or rows.shape[1:]
+            != (
+                self.width,
+                PNG_CHANNELS,
+            )
+        ):
+            raise ValueError(
+                f"Expected uint8 rows of shape (n, {self.width}, {PNG_CHANNELS}). Got {rows.dtype} {rows.shape}."
+            )
+        if rows.shape[0] == 0:
+            return
+        if self.rows_written + rows.shape[0] > self.height:
+            raise ValueError(f"Too many rows for PNG of height {self.height}.")
+
+        # Filter and compress in chunks to limit copies of the rows.
+        rows_per_chunk = max(1, PNG_CHUNK_BYTES // (self.width * PNG_CHANNELS))
+        for row_st in range(0, rows.shape[0], rows_per_chunk):
+            self._write_chunk_rows(rows[row_st : row_st + rows_per_chunk])
+
+    def _write_chunk_rows(self, rows: np.ndarray) -> None:
+        # Prefix each row with filter type 2 (Up) and store the difference from the row above.
+        # Vertical features like HOR tracks become runs of zeros.
+        flat_rows = rows.reshape(rows.shape[0], -1)
+        filtered = np.empty((rows.shape[0], flat_rows.shape[1] + 1), np.uint8)
+        filtered[:, 0] = PNG_FILTER_UP
+        np.subtract(flat_rows[0], self._prev_row, out=filtered[0, 1:])
+        np.subtract(flat_rows[1:], flat_rows[:-1], out=filtered[1:, 1:])
+        self._prev_row = flat_rows[-1].copy()
+
+        data = self._compressor.compress(filtered)
+        if data:
+            self._write_chunk(b"IDAT", data)
+        self.rows_written += rows.shape[0]
+
+    def close(self) -> None:
+        """
+        Finish the image and close the file if opened by the writer.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(
+                    f"Only {self.rows_written} of {self.height} rows written to PNG."
+                )
+            self._write_chunk(b"IDAT", self._compressor.flush())
+            self._write_chunk(b"IEND", b"")
+        finally:
+            if self._own_fh:
+                self._fh.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            # Don't mask the original error with an incomplete image error.
+            self._closed = True
+            if self._own_fh:
+                self._fh.close()
+            return
+        self.close()
+
+
+def save_png_tiled(
+    fig: Figure,
+    outfile: str,
+    *,
+    dpi: float,
+    transparent: bool,
+    max_pixels: int,
+) -> None:
+    """
+    Save a figure as a PNG by rendering it in horizontal strips.
+
+    Each strip is rendered and streamed into a `PNGWriter` so peak memory is bounded by `max_pixels` rather than the full canvas.
+    The figure is drawn once per strip so this trades rendering time for memory.
+
+    Each strip overlaps its neighbors by up to `PNG_TILE_OVERLAP` inches, which is cropped, so paths are only cut by the canvas outside the rows kept.
+    The overlap is at most a quarter of the rows rendered so small strips aren't mostly overlap.
+    Output is close to but not the same as an untiled render.
+    Agg simplifies paths from where they enter the canvas, so dense lines can differ by a few antialiased pixels.
+
+    > [!NOTE] The figure layout should already be solved and its layout engine removed. Otherwise, it's solved again for each strip.
+
+    # Args
+    * `fig`
+        * Figure to save.
+    * `outfile`
+        * Output PNG file.
+    * `dpi`
+        * Output DPI.
+    * `transparent`
+        * Output a transparent image.
+    * `max_pixels`
+        * Maximum number of pixels rendered at once, including the overlap. At least one row is kept per strip.
+
+    # Returns
+    * None
+    """
+    fig_width, fig_height = fig.get_size_inches()
+    # Same as size of canvas created by matplotlib.
+    width, height = int(fig_width * dpi), int(fig_height * dpi)
+    max_rows = max(1, max_pixels // width)
+    # Keep at least half of the rows rendered per strip.
+    overlap = min(math.ceil(PNG_TILE_OVERLAP * dpi), max_rows // 4)
+    rows_per_strip = max(1, max_rows - 2 * overlap)
+
+    with PNGWriter(outfile, width, height, dpi=dpi) as writer:
+        for row_st in range(0, height, rows_per_strip):
+            row_end = min(height, row_st + rows_per_strip)
+            render_st = max(0, row_st - overlap)
+            render_end = min(height, row_end + overlap)
+            # Figure coordinates start from the bottom-left.
+            strip = Bbox.from_extents(
+                0,
+                (height - render_end) / dpi,
+                width / dpi,
+                (height - render_st) / dpi,
+            )
+            buf = io.BytesIO()
+            fig.savefig(
+                buf,
+                format="rgba",
+                dpi=dpi,
+                transparent=transparent,
+                bbox_inches=strip,
+                pad_inches=0,
+            )
+            rows = np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(
+                -1, width, PNG_CHANNELS
+            )
+            writer.write_rows(rows[row_st - render_st : row_end - render_st])
@@ -0,0 +1,262 @@
+import math
+import dataclasses
+import numpy as np
+import polars as pl
+
+from .settings import PlotSettings
+from ..track.types import Track, TrackType
+
+# Columns that determine how an interval is drawn.
+INTERVAL_DRAW_COLS = {
+    TrackType.HOR: ("name", "mer", "color"),
+    TrackType.HORSplit: ("name", "mer", "color"),
+    TrackType.Label: ("name", "color"),
+    TrackType.LocalSelfIdent: ("name", "color"),
+}
+
+
+def get_preview_settings(settings: PlotSettings) -> PlotSettings:
+    """
+    Get plot settings for a preview. The figure dimensions are kept so the layout matches the full figure.
+
+    # Args
+    * `settings`
+        * Plot settings.
+
+    # Returns
+    * Copy of `settings` with the DPI capped to `PlotSettings.preview_max_px` and only `png` output.
+    """
+    max_dpi = int(settings.preview_max_px / max(settings.dim))
+    return dataclasses.replace(
+        settings,
+        dpi=max(1, min(settings.dpi, max_dpi)),
+        format="png",
+        max_tile_pixels=None,
+    )
+
+
+def decimate_intervals(
+    df: pl.DataFrame, cols: tuple[str, ...], xmin: float, bin_size: float
+) -> pl.DataFrame:
+    """
+    Reduce intervals to those visible at a resolution of `bin_size`.
+    * Intervals are drawn in order onto bins so each bin is owned by the last interval covering it.
+    * Intervals smaller than half a bin may not be drawn.
+    * Each run of bins is converted back to an interval and adjacent intervals with the same values in `cols` are merged.
+    * The first interval with each unique value of `cols` is also kept so legends have the same entries in the same order.
+
+    # Args
+    * `df`
+        * Intervals with `chrom_st` and `chrom_end` columns.
+    * `cols`
+        * Columns that determine how an interval is drawn. Missing columns are ignored.
+    * `xmin`
+        * Start position of the first bin.
+    * `bin_size`
+        * Bin size. Typically, the number of bp per pixel.
+
+    # Returns
+    * Decimated intervals.
+    """
+    cols = tuple(col for col in cols if col in df.columns)
+    df_first = (
+        df.unique(cols, keep="first", maintain_order=True) if cols else df.clear()
+    )
+
+    n_bins = math.ceil((df["chrom_end"].max() + 1 - xmin) / bin_size)  # type: ignore[operator]
+    # Intervals cover the bins nearest their ends. Intervals less than half a bin may not cover any.
+    bin_st = np.round((df["chrom_st"].to_numpy() - xmin) / bin_size).astype(np.int64)
+    bin_end = np.round((df["chrom_end"].to_numpy() + 1 - xmin) / bin_size).astype(
+        np.int64
+    )
+    owner = np.full(max(n_bins, 0), -1, dtype=np.int64)
+    for idx, (st, end) in enumerate(
+        zip(bin_st.clip(0, n_bins), bin_end.clip(0, n_bins))
+    ):
+        owner[st:end] = idx
+
+    # Runs of bins with the same owner.
+    run_st = np.flatnonzero(np.diff(owner, prepend=-2))
+    run_end = np.append(run_st[1:], len(owner))
+    has_owner = owner[run_st] != -1
+    run_st, run_end = run_st[has_owner], run_end[has_owner]
+
+    df_runs = df[owner[run_st]].with_columns(
+        chrom_st=pl.Series(xmin + run_st * bin_size).round().cast(df["chrom_st"].dtype),
+        # End is drawn inclusive.
+        chrom_end=pl.Series(xmin + run_end * bin_size - 1)
+        .round()
+        .cast(df["chrom_end"].dtype),
+    )
+    is_new_interval = pl.any_horizontal(
+        (pl.col("chrom_st") - pl.col("chrom_end").shift(1)) > 1,
+        *(pl.col(col).ne_missing(pl.col(col).shift(1)) for col in cols),
+    ).fill_null(True)
+    df_merged = (
+        df_runs.with_columns(grp_lod=is_new_interval.cum_sum())
+        .group_by("grp_lod", maintain_order=True)
+        .agg(
+            pl.col("chrom_st").first(),
+            pl.col("chrom_end").last(),
+            pl.exclude("chrom_st", "chrom_end").first(),
+        )
+        .select(df.columns)
+    )
+    return pl.concat([df_first, df_merged])
+
+
+def bin_bars(df: pl.DataFrame, xmin: float, bin_size: float) -> pl.DataFrame:
+    """
+    Bin bars into bins of `bin_size` keeping the max value in each bin.
+    * Other columns take the value of the first bar in each bin.
+
+    # Args
+    * `df`
+        * Bars with `chrom_st`, `chrom_end`, and numeric `name` columns.
+    * `xmin`
+        * Start position of the first bin.
+    * `bin_size`
+        * Bin size.
+
+    # Returns
+    * Binned bars.
+    """
+    return (
+        df.with_columns(
+            bin_bar=((pl.col("chrom_st") - xmin) / bin_size).floor(),
+        )
+        .group_by("bin_bar", maintain_order=True)
+        .agg(
+            pl.col("chrom_st").min(),
+            pl.col("chrom_end").max(),
+            pl.col("name").max(),
+            pl.exclude("chrom_st", "chrom_end", "name").first(),
+        )
+        .select(df.columns)
+    )
+
+
+def decimate_self_ident(df: pl.DataFrame, xmin: float, bin_size: float) -> pl.DataFrame:
+    """
+    Reduce self-identity diamonds to rectangles on a grid with cells `bin_size` wide.
+    * Each cell takes the color of the diamond with the highest identity centered in it.
+    * Cells have the aspect ratio of the diamonds and are widened to the spacing of the diamonds if needed.
+    * Runs of cells in a row with the same color are merged into a single rectangle.
+    * Returned as is if this doesn't reduce the number of polygons.
+
+    # Args
+    * `df`
+        * Diamond vertices with `x`, `y`, `group`, `color`, and `percent_identity_by_events` columns.
+    * `xmin`
+        * Start position of the first cell.
+    * `bin_size`
+        * Cell width. Typically, the number of bp per pixel.
+
+    # Returns
+    * Decimated polygon vertices.
+    """
+    df_diams = df.group_by("group", maintain_order=True).agg(
+        pl.exclude("x", "y").first(),
+        cx=pl.col("x").mean(),
+        cy=pl.col("y").mean(),
+        width=pl.col("x").max() - pl.col("x").min(),
+        height=pl.col("y").max() - pl.col("y").min(),
+    )
+    median_width = df_diams["width"].median()
+    if not median_width:
+        return df
+    width = float(median_width)  # type: ignore[arg-type]
+
+    # Diamond centers are on a checkerboard lattice with a pitch of width / sqrt(2) in each row. Smaller cells leave gaps.
+    cell_x = max(bin_size, width / math.sqrt(2))
+    cell_y = cell_x * df_diams["height"].median() / width  # type: ignore[operator]
+    df_cells = (
+        df_diams.with_columns(
+            cell_x=((pl.col("cx") - xmin) / cell_x).floor().cast(pl.Int64),
+            cell_y=(pl.col("cy") / cell_y).floor().cast(pl.Int64),
+        )
+        .sort("percent_identity_by_events", descending=True, maintain_order=True)
+        .group_by("cell_x", "cell_y", maintain_order=True)
+        .first()
+        .sort("cell_y", "cell_x")
+    )
+    is_new_run = pl.any_horizontal(
+        pl.col("cell_y") != pl.col("cell_y").shift(1),
+        pl.col("cell_x") != pl.col("cell_x").shift(1) + 1,
+        pl.col("color").ne_missing(pl.col("color").shift(1)),
+    ).fill_null(True)
+    df_runs = (
+        df_cells.with_columns(group=is_new_run.cum_sum() - 1)
+        .group_by("group", maintain_order=True)
+        .agg(
+            pl.exclude("cell_x", "percent_identity_by_events").first(),
+            pl.col("percent_identity_by_events").max(),
+            cell_st=pl.col("cell_x").min(),
+            cell_end=pl.col("cell_x").max() + 1,
+        )
+    )
+    if df_runs.height >= df_diams.height:
+        return df
+
+    return (
+        df_runs.with_columns(
+            new_x=pl.concat_list("cell_st", "cell_end", "cell_end", "cell_st"),
+            new_y=pl.concat_list(
+                "cell_y", "cell_y", pl.col("cell_y") + 1, pl.col("cell_y") + 1
+            ),
+        )
+        .explode("new_x", "new_y")
+        .with_columns(
+            x=xmin + pl.col("new_x") * cell_x,
+            y=pl.col("new_y") * cell_y,
+        )
+        .select(df.columns)
+    )
+
+
+def decimate_tracks(
+    tracks: list[Track], settings: PlotSettings, xmin: float, xmax: float
+) -> list[Track]:
+    """
+    Reduce the number of elements drawn for dense tracks to about one per pixel.
+    * `TrackType.HOR`, `TrackType.HORSplit`, and rectangular `TrackType.Label` intervals are reduced to about one per pixel.
+    * `TrackType.Bar` tracks with more bars than pixels are binned by pixel, keeping the max value.
+    * `TrackType.SelfIdent` diamonds are binned to a pixel grid, keeping the max identity, and runs of cells with the same color are merged.
+    * Other tracks are returned as is.
+
+    # Args
+    * `tracks`
+        * Input `Track`s. These are not modified.
+    * `settings`
+        * Plot settings with the output DPI.
+    * `xmin`
+        * Min x-axis position.
+    * `xmax`
+        * Max x-axis position.
+
+    # Returns
+    * `Track`s with decimated data.
+    """
+    width_px = settings.dim[0] * settings.dpi
+    bp_per_px = (xmax - xmin) / width_px
+
+    new_tracks = []
+    for track in tracks:
+        cols = INTERVAL_DRAW_COLS.get(track.opt)
+        if track.data.is_empty():
+            data = track.data
+        elif cols and getattr(track.options, "shape", "rect") == "rect":
+            data = decimate_intervals(track.data, cols, xmin, bp_per_px)
+        elif (
+            track.opt == TrackType.Bar
+            and track.data["name"].dtype.is_numeric()
+            and track.data.height > width_px
+        ):
+            data = bin_bars(track.data, xmin, bp_per_px)
+        elif track.opt == TrackType.SelfIdent:
+            data = decimate_self_ident(track.data, xmin, bp_per_px)
+        else:
+            data = track.data
+        new_tracks.append(dataclasses.replace(track, data=data))
+
+    return new_tracks
@@ -1,7 +1,9 @@
+import numpy as np
 import polars as pl
 
 from matplotlib.axes import Axes
 from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
 from intervaltree import Interval, IntervalTree  # type: ignore[import-untyped]
 
 from .utils import format_ax
@@ -65,7 +67,6 @@ def draw_self_ident(
     invert = track.options.invert
     legend = track.options.legend
 
-    colors, verts = [], []
     spines = ("right", "left", "top", "bottom") if hide_x else ("right", "left", "top")
     format_ax(
         ax,
@@ -81,15 +82,36 @@ def draw_self_ident(
     else:
         df_track = track.data
 
-    for _, df_diam in df_track.group_by(["group"]):
-        df_points = df_diam.select("x", "y")
-        color = df_diam["color"].first()
-        colors.append(color)
-        verts.append(df_points)
+    # Keep order so overlapping diamonds are drawn the same way each time.
+    df_diams = df_track.group_by(["group"], maintain_order=True).agg(
+        pl.col("x"), pl.col("y"), pl.col("color").first()
+    )
+    verts: np.ndarray | list[np.ndarray]
+    n_points = df_diams["x"].list.len().unique()
+    if len(n_points) == 1:
+        # Same number of points so paths are created from a single array.
+        verts = np.stack(
+            [df_diams[col].list.to_array(n_points[0]).to_numpy() for col in ("x", "y")],
+            axis=-1,
+        )
+    else:
+        verts = [
+            np.column_stack(points)
+            for points in zip(df_diams["x"].to_numpy(), df_diams["y"].to_numpy())
+        ]
+
+    colors = df_diams["color"]
+    facecolors: np.ndarray | list[str | None]
+    if colors.null_count() == 0:
+        # Few unique colors so convert each once.
+        uniq_colors, color_idx = np.unique(colors.to_numpy(), return_inverse=True)
+        facecolors = to_rgba_array(uniq_colors)[color_idx]
+    else:
+        facecolors = colors.to_list()
 
     # https://stackoverflow.com/a/29000246
-    polys = PolyCollection(verts, zorder=zorder)
-    polys.set(array=None, facecolors=colors)
+    polys = PolyCollection(verts, zorder=zorder)  # type: ignore[arg-type]
+    polys.set(array=None, facecolors=facecolors)
     ax.add_collection(polys)
 
     ymin, ymax = (
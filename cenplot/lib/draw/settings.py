@@ -54,6 +54,26 @@ class PlotSettings:
     """
     Set the plot DPI per plot.
     """
+    max_tile_pixels: int | None = None
+    """
+    Render `png` output in horizontal strips of at most this many pixels.
+    * Bounds peak memory by this pixel budget rather than the full canvas of `dim` * `dpi`.
+    * Each strip redraws the figure so rendering is slower.
+    * Output matches an untiled render within antialiasing, as strips cut paths differently. Dense lines may differ by a few pixels.
+    * If `None`, render the whole canvas at once.
+    """
+    preview: bool = False
+    """
+    Render a fast, low resolution preview with the same layout as the full figure.
+    * Caps the image dimensions to `preview_max_px`.
+    * Merges or bins elements of dense tracks to about one per pixel.
+    * Skips expensive legends like the self-identity histogram, leaving their axis blank.
+    * Only outputs `png`.
+    """
+    preview_max_px: int = 1200
+    """
+    Max width or height of a preview in pixels.
+    """
     layout: str = "tight"
     """
     Layout engine option for matplotlib. See https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.figure.html#matplotlib.pyplot.figure.
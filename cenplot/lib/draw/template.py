@@ -0,0 +1,207 @@
+import numpy as np
+
+from matplotlib import rcParams
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure, SubplotParams
+from matplotlib.ticker import AutoLocator, NullLocator, ScalarFormatter
+
+from .settings import PlotSettings
+from .utils import SubplotLayout, create_subplots, get_subplot_layout
+from ..track.types import Track
+
+
+class FigureTemplate:
+    """
+    Reusable figure skeleton shared across chroms with the same track layout.
+
+    The figure and its axes are built once. On each reuse, only the data artists, labels, and axis limits are reset.
+    If the layout changes (ex. a different number of `TrackType.HORSplit` tracks), the figure is rebuilt.
+
+    # Usage
+    ```python
+    import cenplot
+
+    template = cenplot.FigureTemplate()
+    for chrom in chroms:
+        track_list, settings = cenplot.read_tracks("tracks.toml", chrom=chrom)
+        cenplot.plot_tracks(track_list.tracks, settings, outdir="plots", chrom=chrom, template=template)
+    ```
+
+    > [!NOTE] The same `Figure` is returned by `cenplot.plot_tracks` for every chrom. Save or copy it before plotting the next chrom.
+    """
+
+    def __init__(self, *, freeze_layout: bool = True) -> None:
+        """
+        # Args
+        * `freeze_layout`
+            * Solve the layout engine only once, on the first figure drawn, and reuse the axes positions for every chrom.
+            * Track or legend labels that are much longer than those of the first chrom may be clipped.
+        """
+        self.freeze_layout = freeze_layout
+        self._key: tuple | None = None
+        self._fig: Figure | None = None
+        self._axes: np.ndarray | None = None
+        self._layout_solved = False
+        self._title_y: float | None = None
+
+    @staticmethod
+    def _layout_key(layout: SubplotLayout, settings: PlotSettings) -> tuple:
+        return (
+            tuple(layout.height_ratios),
+            tuple(layout.width_ratios),
+            tuple(settings.dim),
+            settings.layout,
+            settings.axis_h_pad,
+        )
+
+    @property
+    def layout_solved(self) -> bool:
+        """
+        Layout has been solved and frozen for the current figure.
+        """
+        return self._layout_solved
+
+    @property
+    def title_y(self) -> float | None:
+        """
+        Position of the figure title solved by the layout engine. Not set if the layout isn't solved or has no title.
+        """
+        return self._title_y if self._layout_solved else None
+
+    def subplots(
+        self, tracks: list[Track], settings: PlotSettings
+    ) -> tuple[Figure, np.ndarray, dict[int, int]]:
+        """
+        Get a figure for a list of `Track`s, reusing the previous one if the layout is the same.
+
+        # Args
+        * `tracks`
+            * Input `Track`s
+        * `settings`
+            * Plot settings.
+
+        # Returns
+        * Figure, its axes, and a mapping of the idx of `tracks` to the row idx of axes.
+        """
+        layout = get_subplot_layout(tracks, settings)
+        key = self._layout_key(layout, settings)
+
+        if self._fig is not None and self._axes is not None and key == self._key:
+            if not self._layout_solved:
+                # Layout engines start from the current positions so restore the defaults.
+                # SubplotParams defaults to rcParams.
+                defaults = SubplotParams()
+                self._fig.subplotpars.update(
+                    left=defaults.left,
+                    bottom=defaults.bottom,
+                    right=defaults.right,
+                    top=defaults.top,
+                    wspace=defaults.wspace,
+                    hspace=defaults.hspace,
+                )
+            for ax in self._axes.flat:
+                reset_ax(ax)
+                if not self._layout_solved:
+                    ax.set_position(ax.get_subplotspec().get_position(self._fig))
+            if self._fig.get_suptitle():
+                self._fig.suptitle("")
+            return self._fig, self._axes, layout.track_indices
+
+        fig, axes, track_indices = create_subplots(tracks, settings)
+        self._key = key
+        self._fig = fig
+        self._axes = axes
+        self._layout_solved = False
+        self._title_y = None
+        return fig, axes, track_indices
+
+    def finalize(self, fig: Figure) -> None:
+        """
+        Mark the layout of a drawn figure as solved. If `freeze_layout`, removes the layout engine so it isn't run again.
+        """
+        if fig is not self._fig or not self.freeze_layout:
+            return
+        fig.set_layout_engine(None)
+        self._layout_solved = True
+        if fig.get_suptitle():
+            # Otherwise, the title is reset to its default position on the next chrom.
+            self._title_y = fig._suptitle.get_position()[1]  # type: ignore[attr-defined]
+
+
+def reset_ax(ax: Axes) -> None:
+    """
+    Reset an axis to its initial state without recreating it.
+    * Removes all data artists and the legend.
+    * Resets labels, spines, scales, tick locators/formatters, and axis limits.
+    * Resets tick parameters, tick label fonts, and the grid to the rc defaults so they don't carry over from another config.
+    """
+    for artist in (
+        *ax.patches,
+        *ax.collections,
+        *ax.lines,
+        *ax.texts,
+        *ax.images,
+    ):
+        artist.remove()
+
+    legend = ax.get_legend()
+    if legend:
+        legend.remove()
+
+    ax.set_xlabel("")
+    ax.set_ylabel("")
+    ax.set_box_aspect(None)
+    ax.margins(x=rcParams["axes.xmargin"], y=rcParams["axes.ymargin"])
+    for spine in ax.spines.values():
+        spine.set_visible(True)
+
+    if ax.get_yscale() != "linear":
+        ax.set_yscale("linear")
+
+    # Ticks are recreated from rcParams. The grid is stored with the tick parameters.
+    ax.tick_params(axis="both", which="both", reset=True)
+    # Resetting also drops the tick sides set from rcParams when the axis was created.
+    for which, top, bottom, left, right in (
+        (
+            "major",
+            rcParams["xtick.major.top"],
+            rcParams["xtick.major.bottom"],
+            rcParams["ytick.major.left"],
+            rcParams["ytick.major.right"],
+        ),
+        (
+            "minor",
+            rcParams["xtick.minor.top"],
+            rcParams["xtick.minor.bottom"],
+            rcParams["ytick.minor.left"],
+            rcParams["ytick.minor.right"],
+        ),
+    ):
+        ax.tick_params(
+            which=which,
+            top=rcParams["xtick.top"] and top,
+            bottom=rcParams["xtick.bottom"] and bottom,
+            labeltop=rcParams["xtick.labeltop"] and top,
+            labelbottom=rcParams["xtick.labelbottom"] and bottom,
+            left=rcParams["ytick.left"] and left,
+            right=rcParams["ytick.right"] and right,
+            labelleft=rcParams["ytick.labelleft"] and left,
+            labelright=rcParams["ytick.labelright"] and right,
+        )
+    ax.grid(False)
+    ax.grid(
+        rcParams["axes.grid"],
+        which=rcParams["axes.grid.which"],
+        axis=rcParams["axes.grid.axis"],
+    )
+    for axis in (ax.xaxis, ax.yaxis):
+        axis.set_major_locator(AutoLocator())
+        axis.set_major_formatter(ScalarFormatter())
+        axis.set_minor_locator(NullLocator())
+
+    # Restore the unit data limits and autoscaling of a new axis.
+    ax.relim()
+    ax.ignore_existing_data_limits = True
+    ax.set_xlim(0.0, 1.0)
+    ax.set_ylim(0.0, 1.0)
+    ax.set_autoscale_on(True)
@@ -1,39 +1,68 @@
+import os
 import logging
 import numpy as np
-import matplotlib.pyplot as plt
 
-from typing import Any, Iterable
+from typing import Any, Iterable, Literal, NamedTuple, cast
 
 from matplotlib.axes import Axes
 from matplotlib.artist import Artist
 from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
 from matplotlib.backends.backend_pdf import PdfPages
-
-from .settings import PlotSettings
+from PIL import Image
+
+from .png import (
+    PNG_CHANNELS,
+    PNG_CHUNK_BYTES,
+    PNG_PAD,
+    PNGWriter,
+    read_png_size,
+    save_png_tiled,
+)
+from .pdf import merge_pdfs
+from .settings import OutputFormat, PlotSettings
 from ..utils import Unit
+from ..timing import timed
 from ..track.types import LegendPosition, Track, TrackType, TrackPosition
 from ..track.settings import DefaultTrackSettings
 
 
-def create_subplots(
-    tracks: list[Track],
-    settings: PlotSettings,
-    **kwargs: Any,
-) -> tuple[Figure, np.ndarray, dict[int, int]]:
+class SubplotLayout(NamedTuple):
+    """
+    Grid layout of a figure built from a list of `Track`s.
     """
-    Generate a subplot figure from a list of `Track`s.
+
+    height_ratios: list[float]
+    """
+    Height ratio of each row.
+    """
+    width_ratios: list[float]
+    """
+    Width ratio of each column.
+    """
+    track_indices: dict[int, int]
+    """
+    Mapping of the idx of `tracks` to the row idx of axes.
+    """
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.height_ratios), len(self.width_ratios)
+
+
+def get_subplot_layout(tracks: list[Track], settings: PlotSettings) -> SubplotLayout:
+    """
+    Get the subplot grid layout from a list of `Track`s without creating a figure.
 
     # Args
     * `tracks`
         * Input `Track`s
     * `settings`
         * Plot settings.
-    * `kwargs`
-        * Additional arguments passed to `plt.subplots`
 
     # Returns
-    * Figure, its axes, and a mapping of the idx of `tracks` to the row idx of axes.
+    * `SubplotLayout` with the height and width ratios of the grid.
     """
     track_props = []
     track_indices = {}
@@ -85,31 +114,250 @@ def create_subplots(
             track_indices[i] = track_idx - 1
 
     # Adjust columns and width ratio.
-    num_cols = 2 if requires_second_col else 1
     if settings.legend_pos == LegendPosition.Left:
-        width_ratios = (legend_prop, 1 - legend_prop) if requires_second_col else [1.0]
+        width_ratios = [legend_prop, 1 - legend_prop] if requires_second_col else [1.0]
     else:
-        width_ratios = (1 - legend_prop, legend_prop) if requires_second_col else [1.0]
+        width_ratios = [1 - legend_prop, legend_prop] if requires_second_col else [1.0]
 
-    fig, axes = plt.subplots(
+    return SubplotLayout(track_props, width_ratios, track_indices)
+
+
+def create_subplots(
+    tracks: list[Track],
+    settings: PlotSettings,
+    **kwargs: Any,
+) -> tuple[Figure, np.ndarray, dict[int, int]]:
+    """
+    Generate a subplot figure from a list of `Track`s.
+    * The figure is not registered with `pyplot` and is freed once it is no longer referenced.
+
+    # Args
+    * `tracks`
+        * Input `Track`s
+    * `settings`
+        * Plot settings.
+    * `kwargs`
+        * Additional arguments passed to `Figure.subplots`
+
+    # Returns
+    * Figure, its axes, and a mapping of the idx of `tracks` to the row idx of axes.
+    """
+    layout = get_subplot_layout(tracks, settings)
+    num_rows, num_cols = layout.shape
+
+    # Validated by matplotlib.
+    fig_layout = cast(Literal["constrained", "compressed", "tight"], settings.layout)
+    fig = Figure(figsize=settings.dim, layout=fig_layout)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(
         # Count number of tracks
-        len(track_props),
+        num_rows,
         num_cols,
-        figsize=settings.dim,
-        height_ratios=track_props,
-        width_ratios=width_ratios,
+        height_ratios=layout.height_ratios,
+        width_ratios=layout.width_ratios,
         # Always return 2D ndarray
         squeeze=False,
-        layout=settings.layout,
         **kwargs,
     )
 
-    return fig, axes, track_indices
+    return fig, axes, layout.track_indices
+
+
+class _LayoutCanvas(FigureCanvasAgg):
+    """
+    Agg canvas whose renderer is a single pixel.
+    """
+
+    def get_renderer(self) -> RendererAgg:
+        # Text extents only depend on the dpi so layouts are the same as with a full canvas.
+        return RendererAgg(1, 1, self.figure.dpi)
+
+
+def solve_layout(fig: Figure, dpi: float) -> None:
+    """
+    Run the layout engine of a figure at `dpi` without allocating a canvas of its full size.
+    * Axes positions are the same as when drawing the whole canvas at `dpi`.
+
+    # Args
+    * `fig`
+        * Figure with a layout engine.
+    * `dpi`
+        * Output DPI.
+
+    # Returns
+    * None
+    """
+    canvas = fig.canvas
+    fig_dpi = fig.get_dpi()
+    _LayoutCanvas(fig)
+    fig.set_dpi(dpi)
+    try:
+        fig.draw_without_rendering()
+    finally:
+        fig.set_dpi(fig_dpi)
+        fig.set_canvas(canvas)
+
+
+def save_figure(
+    fig: Figure,
+    fname: str,
+    formats: Iterable[OutputFormat],
+    *,
+    dpi: float,
+    transparent: bool,
+    max_tile_pixels: int | None = None,
+) -> list[str]:
+    """
+    Save a figure to one or more formats, solving its layout only once.
+
+    The layout engine is run once at the output `dpi` and then disabled while saving.
+    Each format is rendered once and every format shares the same axes positions regardless of order.
+
+    # Args
+    * `fig`
+        * Figure to save.
+    * `fname`
+        * Output filename without extension.
+    * `formats`
+        * Output formats.
+    * `dpi`
+        * Output DPI.
+    * `transparent`
+        * Output a transparent image.
+    * `max_tile_pixels`
+        * Render `png` output in horizontal strips of at most this many pixels.
+        * See `cenplot.PlotSettings.max_tile_pixels`.
+
+    # Returns
+    * Output filenames.
+    """
+    outfiles = []
+    fig_width, fig_height = fig.get_size_inches()
+    tiled = (
+        bool(max_tile_pixels)
+        and (fig_width * dpi) * (fig_height * dpi) > max_tile_pixels
+    )  # type: ignore[operator]
+
+    layout_engine = fig.get_layout_engine()
+    if layout_engine is not None:
+        with timed("layout"):
+            solve_layout(fig, dpi)
+        fig.set_layout_engine(None)
+
+    try:
+        # Dedupe formats keeping order.
+        for fmt in dict.fromkeys(formats):
+            outfile = f"{fname}.{fmt}"
+            if fmt == "png" and tiled:
+                save_png_tiled(
+                    fig,
+                    outfile,
+                    dpi=dpi,
+                    transparent=transparent,
+                    max_pixels=max_tile_pixels,  # type: ignore[arg-type]
+                )
+            else:
+                fig.savefig(outfile, dpi=dpi, transparent=transparent)
+            outfiles.append(outfile)
+    finally:
+        if layout_engine is not None:
+            fig.set_layout_engine(layout_engine)
+
+    return outfiles
+
+
+def merge_pngs(
+    infiles: list[str], outfile: str, *, max_pixels: int | None = None
+) -> list[str]:
+    """
+    Merge `png` files vertically in order.
+
+    Images are decoded and written one at a time in blocks of rows so only a single image is held in memory.
+    Narrower images are padded on the right with transparent pixels.
+    Raises a `ValueError` if there are no input files.
+
+    # Args
+    * `infiles`
+        * Input `png` files.
+    * `outfile`
+        * Output merged `png` file.
+    * `max_pixels`
+        * Split the output into numbered shards of at most this many pixels.
+            * ex. `merged.png` -> `merged_1.png`, `merged_2.png`, ...
+        * Images are never split so a shard has at least one image.
+        * If `None`, output a single file.
+
+    # Returns
+    * Output merged file(s).
+    """
+    if not infiles:
+        raise ValueError("No png files to merge.")
+
+    sizes = [read_png_size(file) for file in infiles]
+
+    # Group images into shards by the size of the padded output.
+    shards: list[list[int]] = [[]]
+    shard_width, shard_height = 0, 0
+    for idx, (width, height) in enumerate(sizes):
+        new_width = max(shard_width, width)
+        if (
+            max_pixels
+            and shards[-1]
+            and new_width * (shard_height + height) > max_pixels
+        ):
+            shards.append([])
+            new_width, shard_height = width, 0
+        shards[-1].append(idx)
+        shard_width = new_width
+        shard_height += height
+
+    if len(shards) == 1:
+        outfiles = [outfile]
+    else:
+        root, ext = os.path.splitext(outfile)
+        outfiles = [f"{root}_{i}{ext}" for i in range(1, len(shards) + 1)]
+
+    # Every shard has the resolution of the first image.
+    with Image.open(infiles[0]) as img:
+        dpi = img.info.get("dpi", (None,))[0]
+
+    for shard, shard_outfile in zip(shards, outfiles):
+        if not shard:
+            continue
+        width = max(sizes[idx][0] for idx in shard)
+        height = sum(sizes[idx][1] for idx in shard)
+        with PNGWriter(shard_outfile, width, height, dpi=dpi) as writer:
+            for idx in shard:
+                with Image.open(infiles[idx]) as img:
+                    img_rgba = img if img.mode == "RGBA" else img.convert("RGBA")
+                    # Copy rows in blocks rather than the whole image.
+                    rows_per_block = max(
+                        1, PNG_CHUNK_BYTES // (img_rgba.width * PNG_CHANNELS)
+                    )
+                    for row_st in range(0, img_rgba.height, rows_per_block):
+                        row_end = min(img_rgba.height, row_st + rows_per_block)
+                        rows = np.asarray(
+                            img_rgba.crop((0, row_st, img_rgba.width, row_end))
+                        )
+                        if rows.shape[1] < width:
+                            padded_rows = np.full(
+                                (rows.shape[0], width, PNG_CHANNELS),
+                                PNG_PAD,
+                                dtype=np.uint8,
+                            )
+                            padded_rows[:, : rows.shape[1]] = rows
+                            rows = padded_rows
+                        writer.write_rows(rows)
+
+    return outfiles
 
 
 def merge_plots(
-    figures: list[tuple[Figure, np.ndarray, list[str]]], outfile: str
-) -> None:
+    figures: list[tuple[Figure, np.ndarray, list[str]]],
+    outfile: str,
+    *,
+    max_pixels: int | None = None,
+) -> list[str]:
     """
     Merge plots produced by `plot_one_cen`.
 
@@ -119,24 +367,31 @@ def merge_plots(
     * `outfile`
         * Output merged file.
         * Either `png` or `pdf`
+        * If every figure was saved as a `pdf`, their pages are concatenated with `merge_pdfs`. Otherwise, the figures are redrawn.
+    * `max_pixels`
+        * Split a merged `png` into numbered shards of at most this many pixels. See `merge_pngs`.
 
     # Returns
-    * None
+    * Output merged file(s).
     """
     if outfile.endswith(".pdf"):
+        pdf_files = [
+            next((file for file in files if file.endswith(".pdf")), None)
+            for _, _, files in figures
+        ]
+        if all(pdf_files):
+            return merge_pdfs(pdf_files, outfile)  # type: ignore[arg-type]
+
         with PdfPages(outfile) as pdf:
             for fig, _, _ in figures:
                 pdf.savefig(fig)
+        return [outfile]
     else:
-        merged_images = np.concatenate(
-            [
-                plt.imread(file)
-                for _, _, files in figures
-                for file in files
-                if file.endswith("png")
-            ]
+        return merge_pngs(
+            [file for _, _, files in figures for file in files if file.endswith("png")],
+            outfile,
+            max_pixels=max_pixels,
         )
-        plt.imsave(outfile, merged_images)
 
 
 def format_ax(
@@ -6,7 +6,9 @@ from .bed9 import read_bed9
 from .bed_hor import read_bed_hor
 from .bed_label import read_bed_label
 from .bed_identity import read_bed_identity
-from .tracks import read_tracks, read_track
+from .tracks import read_tracks, read_track, TrackCache
+from .shared import SharedTracks
+from .estimate import estimate_tracks, ChromEstimate, TrackEstimate
 
 __all__ = [
     "read_bed9",
@@ -15,4 +17,9 @@ __all__ = [
     "read_bed_identity",
     "read_track",
     "read_tracks",
+    "TrackCache",
+    "SharedTracks",
+    "estimate_tracks",
+    "ChromEstimate",
+    "TrackEstimate",
 ]
@@ -1,11 +1,11 @@
 import os
-import logging
 import polars as pl
 
 from typing import Any, TextIO
 
 from .bed9 import read_bed9
 from .utils import map_value_colors
+from .resources import read_color_map, read_sort_order
 from ..defaults import MONOMER_COLORS, BED9_COLS
 from ..track.settings import HORTrackSettings
 
@@ -81,23 +81,21 @@ def read_bed_hor(
         .collect()
     )
     # Read color map.
-    if color_map_file:
-        color_map: dict[str, str] = {}
-        with open(color_map_file, "rt") as fh:
-            for line in fh.readlines():
-                try:
-                    name, color = line.strip().split()
-                except Exception:
-                    logging.error(f"Invalid color map. ({line})")
-                    continue
-                color_map[name] = color
+    if color_map_file and sort_by == "name":
+        color_map = read_color_map(color_map_file)
+        map_col = "name"
+    elif color_map_file:
+        # Monomers not in color map keep their default color.
+        color_map = {**MONOMER_COLORS, **read_color_map(color_map_file)}
+        map_col = "mer"
     else:
         color_map = MONOMER_COLORS
+        map_col = "mer"
 
     df = map_value_colors(
         df,
-        map_col="mer",
-        map_values=MONOMER_COLORS,
+        map_col=map_col,
+        map_values=color_map,
         use_item_rgb=use_item_rgb,
     )
     df = df.join(df.get_column("name").value_counts(name="hor_count"), on="name")
@@ -105,12 +103,9 @@ def read_bed_hor(
     if hor_filter:
         df = df.filter(pl.col("hor_count") >= hor_filter)
 
+    defined_sort_order: list[int | str] | None
     if os.path.exists(sort_order):
-        with open(sort_order, "rt") as fh:
-            defined_sort_order = []
-            for line in fh:
-                line = line.strip()
-                defined_sort_order.append(int(line) if sort_by == "mer" else line)
+        defined_sort_order = read_sort_order(sort_order, as_int=sort_by == "mer")
     else:
         defined_sort_order = None
 
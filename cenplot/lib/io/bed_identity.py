@@ -4,6 +4,9 @@ import polars as pl
 
 from typing import TextIO
 
+from .cache import read_cached
+from .resources import read_colorscale
+from ..timing import timed
 from .utils import header_info
 from ..track.settings import LocalSelfIdentTrackSettings
 from ..defaults import BED9_COLS, BED_SELF_IDENT_COLS, IDENT_COLORSCALE, Colorscale
@@ -19,14 +22,7 @@ def read_ident_colorscale(
     if isinstance(colorscale, dict):
         return colorscale
 
-    ident_colorscale = {}
-    with open(colorscale, "rt") as fh:
-        for line in fh:
-            st, end, color, *_ = line.strip().split("\t")
-            fst = float(st)
-            fend = float(end)
-            ident_colorscale[(fst, fend)] = color
-    return ident_colorscale
+    return read_colorscale(colorscale)
 
 
 def read_bedpe(
@@ -224,8 +220,6 @@ def read_bed_identity(
     # Returns
     * Coordinates of colored polygons in 2D space.
     """
-    df = read_bedpe(infile=infile, chrom=chrom)
-
     # Check mode. Set by dev not user.
     mode = Dim(mode)
 
@@ -259,28 +253,50 @@ def read_bed_identity(
         rng_expr = pl.lit(None)  # type: ignore[assignment]
 
     if mode == Dim.ONE:
-        df_window = (
-            (df["query_end"] - df["query_st"])
-            .value_counts(sort=True)
-            .rename({"query_end": "window"})
-        )
-        if df_window.shape[0] > 1:
-            logging.warning(f"Multiple windows detected. Taking largest.\n{df_window}")
-        window = df_window.row(0, named=True)["window"] + 1
-        df_local_ident = pl.DataFrame(
-            convert_2D_to_1D_ident(df.iter_rows(), window, band_size, ignore_band_size),
-            schema=[
-                "chrom_st",
-                "chrom_end",
-                "percent_identity_by_events",
-            ],
-            orient="row",
-        )
-        query = df["query"][0]
+
+        @timed("transform", track="local_self_ident")
+        def calculate_local_ident() -> pl.DataFrame:
+            df = read_bedpe(infile=infile, chrom=chrom)
+            df_window = (
+                (df["query_end"] - df["query_st"])
+                .value_counts(sort=True)
+                .rename({"query_end": "window"})
+            )
+            if df_window.shape[0] > 1:
+                logging.warning(
+                    f"Multiple windows detected. Taking largest.\n{df_window}"
+                )
+            window = df_window.row(0, named=True)["window"] + 1
+            return pl.DataFrame(
+                convert_2D_to_1D_ident(
+                    df.iter_rows(), window, band_size, ignore_band_size
+                ),
+                schema=[
+                    "chrom_st",
+                    "chrom_end",
+                    "percent_identity_by_events",
+                ],
+                orient="row",
+            ).with_columns(chrom=pl.lit(df["query"][0]))
+
+        # Slowest step so reuse previous results. Colors are added after so aren't part of the key.
+        if isinstance(infile, str):
+            df_local_ident = read_cached(
+                "local_ident",
+                [infile],
+                {
+                    "chrom": chrom,
+                    "band_size": band_size,
+                    "ignore_band_size": ignore_band_size,
+                },
+                calculate_local_ident,
+            )
+        else:
+            df_local_ident = calculate_local_ident()
+
         df_res = (
             df_local_ident.lazy()
             .with_columns(
-                chrom=pl.lit(query),
                 color=color_expr,
                 name=rng_expr,
                 score=pl.col("percent_identity_by_events"),
@@ -293,8 +309,9 @@ def read_bed_identity(
             .collect()
         )
     else:
+        df = read_bedpe(infile=infile, chrom=chrom)
         tri_side = math.sqrt(2) / 2
-        df_res = (
+        lf_res = (
             df.lazy()
             .with_columns(color=color_expr)
             # Get window size.
@@ -339,6 +356,7 @@ def read_bed_identity(
             .explode("new_x", "new_y")
             # Rename to filter later on.
             .rename({"query": "chrom", "new_x": "x", "new_y": "y"})
-            .collect()
         )
+        with timed("transform", track="self_ident"):
+            df_res = lf_res.collect()
     return df_res, ident_colorscale
@@ -0,0 +1,130 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import polars as pl
+
+from typing import Any, Callable
+from importlib.metadata import version, PackageNotFoundError
+
+from ..defaults import CACHE_DIR_ENV
+
+# Packages whose version changes derived data.
+CACHE_PACKAGES = ("cenplot", "censtats")
+
+
+def get_cache_dir() -> str | None:
+    """
+    Get the dir of cached derived track data. Set by the `CENPLOT_CACHE_DIR` environment variable.
+    """
+    return os.environ.get(CACHE_DIR_ENV) or None
+
+
+def get_cache_key(name: str, files: list[str], params: dict[str, Any]) -> str:
+    """
+    Hash the name of a derived frame, the path, size, and modification time of its input files, its parameters, and the versions of `cenplot` and `censtats`.
+    """
+    fingerprints = []
+    for file in files:
+        stat = os.stat(file)
+        fingerprints.append((os.path.abspath(file), stat.st_size, stat.st_mtime_ns))
+
+    versions: dict[str, str | None] = {}
+    for package in CACHE_PACKAGES:
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "name": name,
+                "files": fingerprints,
+                "params": params,
+                "versions": versions,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def get_cache_path(name: str, files: list[str], params: dict[str, Any]) -> str | None:
+    """
+    Get the path of a cached frame. See `get_cache_key`.
+
+    # Returns
+    * Path to a parquet file or `None` if there is no cache dir.
+    """
+    cache_dir = get_cache_dir()
+    if not cache_dir:
+        return None
+    return os.path.join(
+        cache_dir, name, f"{get_cache_key(name, files, params)}.parquet"
+    )
+
+
+def read_cache(path: str) -> pl.DataFrame | None:
+    """
+    Read a cached frame. `None` if not cached or unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pl.read_parquet(path)
+        logging.debug(f"Read cached frame from {path}.")
+        return df
+    except Exception as err:
+        logging.warning(f"Failed to read cached frame from {path} ({err}).")
+        return None
+
+
+def write_cache(path: str, df: pl.DataFrame) -> None:
+    """
+    Write a frame to the cache.
+    * Written then renamed so concurrent readers never see a partial file.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        df.write_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as err:
+        logging.warning(f"Failed to cache frame to {path} ({err}).")
+
+
+def read_cached(
+    name: str,
+    files: list[str],
+    params: dict[str, Any],
+    fn: Callable[[], pl.DataFrame],
+) -> pl.DataFrame:
+    """
+    Compute a frame derived from files or read it from the cache dir if previously computed with the same files and parameters.
+    * Only cached if the `CENPLOT_CACHE_DIR` environment variable is set.
+    * Frames are stored as parquet files named by `get_cache_key`.
+
+    # Args
+    * `name`
+        * Name of the derived frame. ex. `hor_array_length`
+    * `files`
+        * Input files of `fn`.
+    * `params`
+        * All other inputs of `fn`. Must be JSON serializable.
+    * `fn`
+        * Function computing the frame.
+
+    # Returns
+    * Derived frame.
+    """
+    path = get_cache_path(name, files, params)
+    if not path:
+        return fn()
+
+    df = read_cache(path)
+    if df is None:
+        df = fn()
+        write_cache(path, df)
+    return df
@@ -0,0 +1,279 @@
+"""
+Estimates of the cost of plotting tracks from cheap scans of their files. Nothing is read into tracks or drawn.
+"""
+
+import os
+import polars as pl
+
+from typing import Any, BinaryIO, NamedTuple
+
+from .cache import read_cache
+from .stats import get_stats_path
+from .utils import header_info
+from ..defaults import BED9_COLS, BED_SELF_IDENT_COLS
+from ..draw.preview import get_preview_settings
+from ..draw.settings import PlotSettings
+from ..track.types import NO_DATA_TRACK_OPTS, TrackType
+
+# Artists and vertices added per row of each track type.
+ROW_COST: dict[TrackType, tuple[int, int]] = {
+    # Rectangle patches.
+    TrackType.HOR: (1, 5),
+    TrackType.HORSplit: (1, 5),
+    TrackType.Label: (1, 5),
+    TrackType.Bar: (1, 5),
+    TrackType.LocalSelfIdent: (1, 5),
+    # FancyArrow patches.
+    TrackType.HOROrt: (1, 8),
+    TrackType.Strand: (1, 8),
+    # Diamonds in a single PolyCollection.
+    TrackType.SelfIdent: (0, 5),
+    # Points of a single Line2D.
+    TrackType.Line: (0, 1),
+}
+# Track types drawn as a single artist.
+COLLECTION_TRACK_OPTS = {TrackType.SelfIdent, TrackType.Line}
+# Track types reduced to about one interval per pixel in previews. See `decimate_tracks`.
+DECIMATED_TRACK_OPTS = {
+    TrackType.HOR,
+    TrackType.HORSplit,
+    TrackType.Label,
+    TrackType.Bar,
+}
+RASTER_FORMATS = {"png"}
+# Bytes per pixel of an RGBA canvas.
+CANVAS_PIXEL_BYTES = 4
+
+SLOW_ARTISTS = 50_000
+"""
+Number of artists above which drawing is likely to be slow. Each patch is drawn individually.
+"""
+SLOW_VERTICES = 5_000_000
+"""
+Number of vertices above which drawing is likely to be slow.
+"""
+MAX_CANVAS_BYTES = 2 * 1024**3
+"""
+Size of a raster canvas in bytes above which rendering is likely to exceed memory.
+"""
+
+
+class TrackEstimate(NamedTuple):
+    """
+    Estimated cost of plotting a track.
+    """
+
+    track: str
+    """
+    Index and type of the track. ex. `0:hor`
+    """
+    rows: int
+    """
+    Number of rows. Exact if `cached`. Otherwise, rows in the track file for the chrom before filtering by track options.
+    """
+    artists: int
+    """
+    Number of artists the draw function would create.
+    """
+    vertices: int
+    """
+    Number of vertices the draw function would create.
+    """
+    cached: bool
+    """
+    Whether `rows` is from the cached statistics of a previous read. See `CENPLOT_CACHE_DIR`.
+    """
+
+    @property
+    def slow(self) -> bool:
+        return self.artists > SLOW_ARTISTS or self.vertices > SLOW_VERTICES
+
+
+class ChromEstimate(NamedTuple):
+    """
+    Estimated cost of plotting a chrom.
+    """
+
+    chrom: str | None
+    tracks: list[TrackEstimate]
+    width: int
+    """
+    Canvas width in pixels.
+    """
+    height: int
+    """
+    Canvas height in pixels.
+    """
+    canvas_bytes: int
+    """
+    Size of the largest raster canvas in bytes. Bounded by `PlotSettings.max_tile_pixels`. `0` if no raster output format.
+    """
+
+    @property
+    def rows(self) -> int:
+        return sum(track.rows for track in self.tracks)
+
+    @property
+    def artists(self) -> int:
+        return sum(track.artists for track in self.tracks)
+
+    @property
+    def vertices(self) -> int:
+        return sum(track.vertices for track in self.tracks)
+
+    @property
+    def slow(self) -> bool:
+        return self.artists > SLOW_ARTISTS or self.vertices > SLOW_VERTICES
+
+    @property
+    def exceeds_memory(self) -> bool:
+        return self.canvas_bytes > MAX_CANVAS_BYTES
+
+
+def scan_rows(path: str, chrom: str | None, *, bedpe: bool = False) -> pl.LazyFrame:
+    """
+    Lazily scan the rows of a headerless BED or BEDPE file overlapping a chrom.
+    * Rows are not filtered by track options.
+    """
+    skip_rows, number_cols = header_info(path)
+    if number_cols == 0:
+        return pl.LazyFrame()
+
+    cols: tuple[str, ...]
+    if bedpe:
+        cols = BED_SELF_IDENT_COLS
+        chrom_col, st_col, end_col = "query", "query_st", "query_end"
+    else:
+        cols = BED9_COLS[0:number_cols]
+        chrom_col, st_col, end_col = "chrom", "chrom_st", "chrom_end"
+
+    lf = pl.scan_csv(
+        path,
+        separator="\t",
+        has_header=False,
+        skip_rows=skip_rows,
+        new_columns=list(cols),
+    )
+    if not chrom:
+        return lf
+
+    expr = pl.col(chrom_col) == chrom
+    try:
+        chrom_no_coords, coords = chrom.rsplit(":", 1)
+        chrom_st, chrom_end = [int(elem) for elem in coords.split("-")]
+        expr = expr | (
+            (pl.col(chrom_col) == chrom_no_coords)
+            & (pl.col(end_col) > chrom_st)
+            & (pl.col(st_col) < chrom_end)
+        )
+    except ValueError:
+        pass
+    return lf.filter(expr)
+
+
+def count_track_rows(track: dict[str, Any], chrom: str | None) -> tuple[int, bool]:
+    """
+    Count the rows of a track that would be drawn. Uses the cached statistics of a previous read if any.
+
+    # Returns
+    * Number of rows and whether it was from cached statistics.
+    """
+    opt = TrackType(track.get("type", ""))
+    path = track.get("path")
+    if opt in NO_DATA_TRACK_OPTS or not path or not os.path.exists(path):
+        return 0, False
+
+    stats_path = get_stats_path(track, chrom)
+    df_stats = read_cache(stats_path) if stats_path else None
+    if df_stats is not None:
+        return int(df_stats["rows"].sum()), True
+
+    lf = scan_rows(
+        path, chrom, bedpe=opt in (TrackType.SelfIdent, TrackType.LocalSelfIdent)
+    )
+    if not lf.collect_schema():
+        return 0, False
+    if opt == TrackType.LocalSelfIdent:
+        # One interval per window.
+        expr = pl.col("query_st").n_unique()
+    elif opt == TrackType.HOROrt:
+        # One arrow per run of HORs with the same strand.
+        expr = (pl.col("strand") != pl.col("strand").shift()).sum() + 1
+    else:
+        expr = pl.len()
+    return int(lf.select(expr).collect().item() or 0), False
+
+
+def estimate_tracks(
+    input_track: BinaryIO, *, chrom: str | None = None, preview: bool = False
+) -> ChromEstimate:
+    """
+    Estimate the cost of plotting a `TOML` or `YAML` file of tracks without reading or drawing them.
+
+    # Args
+    * `input_track`
+        * Input track `TOML` or `YAML` file.
+    * `chrom`
+        * Chromosome name in 1st column (`chrom`) to filter for.
+    * `preview`
+        * Estimate the cost of a preview. See `PlotSettings.preview`.
+
+    # Returns
+    * Estimated number of rows, artists, and vertices of each track and the canvas size.
+
+    # Usage
+    ```python
+    import cenplot
+
+    with open("tracks_example_api.toml", "rb") as fh:
+        estimate = cenplot.estimate_tracks(fh, chrom="chm13_chr10:38568472-42561808")
+    print(estimate.artists, estimate.canvas_bytes)
+    ```
+    """
+    from .tracks import load_config
+
+    dict_settings = load_config(input_track)
+    settings: dict[str, Any] = dict(dict_settings.get("settings", {}))
+    if settings.get("dim"):
+        settings["dim"] = tuple(settings["dim"])
+    plot_settings = PlotSettings(**settings)
+    if preview or plot_settings.preview:
+        plot_settings = get_preview_settings(plot_settings)
+
+    width = int(plot_settings.dim[0] * plot_settings.dpi)
+    height = int(plot_settings.dim[1] * plot_settings.dpi)
+    formats = (
+        [plot_settings.format]
+        if isinstance(plot_settings.format, str)
+        else plot_settings.format
+    )
+    canvas_pixels = 0
+    if RASTER_FORMATS.intersection(formats):
+        canvas_pixels = width * height
+        if plot_settings.max_tile_pixels:
+            canvas_pixels = min(canvas_pixels, plot_settings.max_tile_pixels)
+
+    tracks = []
+    for idx, track in enumerate(dict_settings.get("tracks", [])):
+        opt = TrackType(track.get("type", ""))
+        rows, cached = count_track_rows(track, chrom)
+        drawn_rows = rows
+        if (preview or plot_settings.preview) and opt in DECIMATED_TRACK_OPTS:
+            drawn_rows = min(rows, width)
+        artists_per_row, vertices_per_row = ROW_COST.get(opt, (0, 0))
+        artists = drawn_rows * artists_per_row
+        if opt in COLLECTION_TRACK_OPTS and rows:
+            artists += 1
+        tracks.append(
+            TrackEstimate(
+                f"{idx}:{opt}",
+                rows,
+                artists,
+                drawn_rows * vertices_per_row,
+                cached,
+            )
+        )
+
+    return ChromEstimate(
+        chrom, tracks, width, height, canvas_pixels * CANVAS_PIXEL_BYTES
+    )
@@ -0,0 +1,79 @@
+"""
+Readers of small auxiliary files used by track options, like color maps, sort orders, and colorscales.
+
+Each file is parsed once per process and reused across tracks and chroms until its modification time or size changes.
+"""
+
+import os
+import logging
+
+from functools import lru_cache
+
+from ..defaults import Colorscale
+
+# Max number of parsed files kept per reader.
+RESOURCE_CACHE_SIZE = 128
+
+
+def _file_key(path: str) -> tuple[str, int, int]:
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=RESOURCE_CACHE_SIZE)
+def _read_color_map(path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    color_map: dict[str, str] = {}
+    with open(path, "rt") as fh:
+        for line in fh:
+            try:
+                name, color = line.strip().split()
+            except Exception:
+                logging.error(f"Invalid color map. ({line})")
+                continue
+            color_map[name] = color
+    return color_map
+
+
+@lru_cache(maxsize=RESOURCE_CACHE_SIZE)
+def _read_sort_order(
+    path: str, mtime_ns: int, size: int, as_int: bool
+) -> list[int | str]:
+    sort_order: list[int | str] = []
+    with open(path, "rt") as fh:
+        for line in fh:
+            line = line.strip()
+            sort_order.append(int(line) if as_int else line)
+    return sort_order
+
+
+@lru_cache(maxsize=RESOURCE_CACHE_SIZE)
+def _read_colorscale(path: str, mtime_ns: int, size: int) -> Colorscale:
+    colorscale: Colorscale = {}
+    with open(path, "rt") as fh:
+        for line in fh:
+            st, end, color, *_ = line.strip().split("\t")
+            colorscale[(float(st), float(end))] = color
+    return colorscale
+
+
+def read_color_map(path: str) -> dict[str, str]:
+    """
+    Read a two-column headerless color map file of names to colors.
+    """
+    return dict(_read_color_map(*_file_key(path)))
+
+
+def read_sort_order(path: str, *, as_int: bool = False) -> list[int | str]:
+    """
+    Read a single-column file of elements in sort order.
+    * If `as_int`, elements are converted to integers.
+    """
+    return list(_read_sort_order(*_file_key(path), as_int))
+
+
+def read_colorscale(path: str) -> Colorscale:
+    """
+    Read a headerless TSV file of identity ranges to colors.
+    * Columns are `start`, `end`, and `color`.
+    """
+    return dict(_read_colorscale(*_file_key(path)))
@@ -0,0 +1,85 @@
+import os
+import copy
+import uuid
+import dataclasses
+import polars as pl
+
+from ..track.types import Track
+
+
+@dataclasses.dataclass
+class SharedTracks:
+    """
+    Tracks whose data is written to uncompressed Arrow IPC files so other processes can memory-map it rather than receive a pickled copy.
+
+    Only the paths and track settings are pickled when passed to a worker. Workers reading the same file share its pages.
+
+    # Usage
+    ```python
+    import tempfile
+    import cenplot
+    from concurrent.futures import ProcessPoolExecutor
+
+    def plot(shared: cenplot.SharedTracks, settings: cenplot.PlotSettings):
+        return cenplot.plot_tracks(shared.read(), settings, "plots")[2]
+
+    track_list, settings = cenplot.read_tracks(fh, chrom=chrom)
+    with tempfile.TemporaryDirectory() as tmp_dir, ProcessPoolExecutor() as pool:
+        shared = cenplot.SharedTracks.write(track_list.tracks, tmp_dir)
+        files = pool.submit(plot, shared, settings).result()
+    ```
+    """
+
+    tracks: list[Track]
+    """
+    Tracks without data.
+    """
+    files: list[str]
+    """
+    Arrow IPC file with the data of each track.
+    """
+
+    @classmethod
+    def write(cls, tracks: list[Track], outdir: str) -> "SharedTracks":
+        """
+        Write the data of each track to an Arrow IPC file.
+
+        # Args
+        * `tracks`
+            * Tracks to share.
+        * `outdir`
+            * Output dir. Must exist until all processes have read the tracks.
+
+        # Returns
+        * Shared tracks.
+        """
+        os.makedirs(outdir, exist_ok=True)
+        prefix = uuid.uuid4().hex
+        files = []
+        for i, track in enumerate(tracks):
+            file = os.path.join(outdir, f"{prefix}_{i}.arrow")
+            # Compressed files can't be memory-mapped.
+            track.data.write_ipc(file, compression="uncompressed")
+            files.append(file)
+
+        return cls(
+            [dataclasses.replace(track, data=pl.DataFrame()) for track in tracks],
+            files,
+        )
+
+    def read(self) -> list[Track]:
+        """
+        Memory-map the data of each track.
+        * Data is read-only and backed by the file.
+
+        # Returns
+        * Tracks with data.
+        """
+        return [
+            dataclasses.replace(
+                track,
+                data=pl.read_ipc(file, memory_map=True, rechunk=False),
+                options=copy.copy(track.options),
+            )
+            for track, file in zip(self.tracks, self.files)
+        ]
@@ -0,0 +1,102 @@
+import polars as pl
+
+from typing import Any, NamedTuple
+
+from .cache import get_cache_path, read_cache, write_cache
+from ..track.types import NO_DATA_TRACK_OPTS, Track, TrackType
+
+STATS_SCHEMA = {"rows": pl.Int64, "min": pl.Float64, "max": pl.Float64}
+
+
+class ChromStats(NamedTuple):
+    """
+    Statistics of the tracks of a chrom.
+    """
+
+    rows: int
+    """
+    Number of rows across all tracks.
+    """
+    xlim: tuple[int, int] | None
+    """
+    x-axis limits `read_tracks` would set. `None` if no track has data.
+    """
+
+
+def get_stats_path(track: dict[str, Any], chrom: str | None) -> str | None:
+    """
+    Get the path of the cached statistics of a track in a `TOML` or `YAML` file. `None` if there is no cache dir.
+    * Must be called before the track is read as reading modifies its options.
+    """
+    from .tracks import get_track_files
+
+    return get_cache_path(
+        "track_stats",
+        get_track_files(track),
+        {"track": track, "chrom": chrom},
+    )
+
+
+def get_track_stats(tracks: list[Track]) -> pl.DataFrame:
+    """
+    Get the number of rows and the min start and max end of each track with data.
+    * Uses the same columns as `get_min_max_track`.
+    """
+    rows = []
+    for trk in tracks:
+        if trk.opt in NO_DATA_TRACK_OPTS:
+            continue
+        if trk.opt == TrackType.SelfIdent:
+            min_col, max_col = "x", "x"
+        else:
+            min_col, max_col = "chrom_st", "chrom_end"
+
+        trk_min, trk_max = None, None
+        if not trk.data.is_empty():
+            trk_min = trk.data.filter(pl.col(min_col) >= 0)[min_col].min()
+            trk_max = trk.data[max_col].max()
+        rows.append({"rows": trk.data.height, "min": trk_min, "max": trk_max})
+
+    return pl.DataFrame(rows, schema=STATS_SCHEMA)
+
+
+def write_track_stats(path: str, tracks: list[Track]) -> None:
+    write_cache(path, get_track_stats(tracks))
+
+
+def read_chrom_stats(
+    dict_settings: dict[str, Any], chrom: str | None
+) -> ChromStats | None:
+    """
+    Get the statistics of a chrom from the cached statistics of each of its tracks. Written by `read_tracks` if the `CENPLOT_CACHE_DIR` environment variable is set.
+
+    # Args
+    * `dict_settings`
+        * Loaded `TOML` or `YAML` file of tracks.
+    * `chrom`
+        * Chrom name.
+
+    # Returns
+    * Statistics or `None` if any track hasn't been read.
+    """
+    dfs = []
+    for track in dict_settings.get("tracks", []):
+        path = get_stats_path(track, chrom)
+        df = read_cache(path) if path else None
+        if df is None:
+            return None
+        dfs.append(df)
+
+    df_stats = pl.concat(dfs) if dfs else pl.DataFrame(schema=STATS_SCHEMA)
+    # Ignore tracks without positive starts or with no max. See get_min_max_track.
+    xmin = df_stats["min"].drop_nulls().min()
+    xmax = df_stats.filter(pl.col("max") != 0)["max"].drop_nulls().max()
+    xlim: tuple[int, int] | None = None
+    if xmin is not None and xmax is not None:
+        settings_xlim = dict_settings.get("settings", {}).get("xlim")
+        if settings_xlim:
+            xlim = tuple(settings_xlim)  # type: ignore[assignment]
+        else:
+            xlim = (int(xmin), int(xmax))  # type: ignore[arg-type]
+
+    return ChromStats(int(df_stats["rows"].sum()), xlim)
@@ -1,12 +1,20 @@
 import os
+import copy
+import json
 import yaml
 import tomllib
 import logging
+import multiprocessing
+import dataclasses
 import polars as pl
 
 from typing import Any, Generator, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
 from censtats.length import hor_array_length  # type: ignore[import-untyped]
 
+from .cache import read_cached
+from .stats import get_stats_path, write_track_stats
+from ..timing import timed
 from .utils import get_min_max_track, map_value_colors
 from .bed9 import read_bed9
 from .bed_identity import read_bed_identity
@@ -172,14 +180,30 @@ def read_track(
                 k = opt.replace("arr_opt_", "")
                 hor_length_kwargs[k] = value
 
-        df_hor = read_bed_hor(
-            path,
-            chrom=chrom,
-            live_only=live_only,
-            mer_filter=mer_filter,
-        )
+        def calculate_hor_array_length() -> pl.DataFrame:
+            df_hor = read_bed_hor(
+                path,
+                chrom=chrom,
+                live_only=live_only,
+                mer_filter=mer_filter,
+            )
+            with timed("transform", track="hor_array_length"):
+                _, df_arr = hor_array_length(df_hor, **hor_length_kwargs)
+            return df_arr
+
         try:
-            _, df_track = hor_array_length(df_hor, **hor_length_kwargs)
+            # Slowest step so reuse previous results.
+            df_track = read_cached(
+                "hor_array_length",
+                [path],
+                {
+                    "chrom": chrom,
+                    "live_only": live_only,
+                    "mer_filter": mer_filter,
+                    "kwargs": hor_length_kwargs,
+                },
+                calculate_hor_array_length,
+            )
         except ValueError:
             logging.error(f"Failed to calculate HOR array length for {path}.")
             df_track = pl.DataFrame(
@@ -248,8 +272,103 @@ def read_track(
     yield Track(title, track_pos, track_opt, prop, df_track, track_options)
 
 
+def load_config(input_track: BinaryIO) -> dict[str, Any]:
+    """
+    Load a `TOML` or `YAML` file of tracks.
+    """
+    # Reset file position.
+    input_track.seek(0)
+    # Try TOML
+    try:
+        return tomllib.load(input_track)
+    except Exception:
+        input_track.seek(0)
+        # Then YAML
+        try:
+            return yaml.safe_load(input_track)
+        except Exception:
+            raise TypeError("Invalid file type for settings.")
+
+
+def get_track_files(track: dict[str, Any]) -> list[str]:
+    """
+    Get the files used by a track in a `TOML` or `YAML` file. Includes its `path` and any option that is a file.
+    """
+    files = []
+    values: list[Any] = [track]
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+        elif isinstance(value, str) and os.path.isfile(value) and value not in files:
+            files.append(value)
+    return sorted(files)
+
+
+class TrackCache:
+    """
+    Tracks read from each track of a `TOML` or `YAML` file by `read_tracks`.
+
+    Tracks are read again only if their settings, chrom, or the modification time of any of their files change.
+
+    # Usage
+    ```python
+    import cenplot
+
+    track_cache = cenplot.TrackCache()
+    # Only modified tracks are read again.
+    for _ in range(2):
+        with open("tracks.toml", "rb") as fh:
+            track_list, settings = cenplot.read_tracks(fh, chrom=chrom, track_cache=track_cache)
+        # Remove tracks not read since the last call.
+        track_cache.prune()
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._tracks: dict[tuple, list[Track]] = {}
+        self._used: set[tuple] = set()
+
+    @staticmethod
+    def _key(track: dict[str, Any], chrom: str | None) -> tuple:
+        files = []
+        for file in get_track_files(track):
+            stat = os.stat(file)
+            files.append((file, stat.st_mtime_ns, stat.st_size))
+        return (chrom, json.dumps(track, sort_keys=True, default=str), tuple(files))
+
+    def read(self, track: dict[str, Any], *, chrom: str | None = None) -> list[Track]:
+        """
+        Read a track, reusing a previous read if unchanged. See `read_track`.
+        * Copies are returned as plotting modifies tracks.
+        """
+        key = self._key(track, chrom)
+        self._used.add(key)
+        if key not in self._tracks:
+            self._tracks[key] = list(read_track(track, chrom=chrom))
+        return [
+            dataclasses.replace(trk, options=copy.copy(trk.options))
+            for trk in self._tracks[key]
+        ]
+
+    def prune(self) -> None:
+        """
+        Remove tracks not read since the last prune.
+        """
+        self._tracks = {
+            key: tracks for key, tracks in self._tracks.items() if key in self._used
+        }
+        self._used = set()
+
+
 def read_tracks(
-    input_track: BinaryIO, *, chrom: str | None = None
+    input_track: BinaryIO,
+    *,
+    chrom: str | None = None,
+    threads: int | None = None,
+    track_cache: TrackCache | None = None,
 ) -> tuple[TrackList, PlotSettings]:
     """
     Read a `TOML` or `YAML` file of tracks to plot optionally filtering for a chrom name.
@@ -283,31 +402,58 @@ def read_tracks(
     * chrom:
         * Chromosome name in 1st column (`chrom`) to filter for.
         * ex. `chr4`
+    * threads:
+        * Number of threads used to read track files concurrently. Tracks are returned in the same order.
+        * If `None`, one per track up to the number of CPUs. Serially if run in a worker process, like those of `cenplot draw -p`.
+        * If `1`, read serially.
+    * track_cache:
+        * Reuse tracks previously read with this cache if their settings and files haven't changed. See `TrackCache`.
+
+    If the `CENPLOT_CACHE_DIR` environment variable is set, the statistics of each track are also cached. See `cenplot.lib.io.stats.read_chrom_stats`.
 
     # Returns:
     * List of tracks w/contained chroms and plot settings.
     """
     all_tracks = []
     chroms: set[str] = set()
-    # Reset file position.
-    input_track.seek(0)
-    # Try TOML
-    try:
-        dict_settings = tomllib.load(input_track)
-    except Exception:
-        input_track.seek(0)
-        # Then YAML
-        try:
-            dict_settings = yaml.safe_load(input_track)
-        except Exception:
-            raise TypeError("Invalid file type for settings.")
+    dict_settings = load_config(input_track)
 
     settings: dict[str, Any] = dict_settings.get("settings", {})
     if settings.get("dim"):
         settings["dim"] = tuple(settings["dim"])
 
-    for track_info in dict_settings.get("tracks", []):
-        for track in read_track(track_info, chrom=chrom):
+    tracks_info: list[dict[str, Any]] = dict_settings.get("tracks", [])
+    if threads is None:
+        # Workers of a process pool already use every CPU between them.
+        in_worker = multiprocessing.parent_process() is not None
+        threads = 1 if in_worker else min(len(tracks_info), os.cpu_count() or 1)
+
+    def read_track_list(idx: int, track_info: dict[str, Any]) -> list[Track]:
+        # Key before reading as reading modifies options.
+        stats_path = get_stats_path(track_info, chrom)
+        with timed("read", chrom=chrom, track=f"{idx}:{track_info.get('type')}"):
+            if track_cache is not None:
+                tracks = track_cache.read(track_info, chrom=chrom)
+            else:
+                tracks = list(read_track(track_info, chrom=chrom))
+        if stats_path and not os.path.exists(stats_path):
+            write_track_stats(stats_path, tracks)
+        return tracks
+
+    if threads > 1:
+        # Reading is mostly done by polars which releases the GIL.
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            tracks_read = list(
+                pool.map(read_track_list, range(len(tracks_info)), tracks_info)
+            )
+    else:
+        tracks_read = [
+            read_track_list(idx, track_info)
+            for idx, track_info in enumerate(tracks_info)
+        ]
+
+    for tracks in tracks_read:
+        for track in tracks:
             all_tracks.append(track)
             # Tracks legend and position have no data.
             if track.data.is_empty():
@@ -67,6 +67,12 @@ def adj_by_ctg_coords(df: pl.DataFrame, colname: str) -> pl.DataFrame:
     )
 
 
+class NoTrackDataError(ValueError):
+    """
+    No track has data to get the limits of the plot from.
+    """
+
+
 def no_data_log_message(i: int, title: str | None, col: str):
     logging.error(
         f"No data for track {i} ({title=}). "
@@ -117,7 +123,7 @@ def get_min_max_track(
                 track = trk
                 pos = trk_max
     if not track:
-        raise ValueError(
+        raise NoTrackDataError(
             f"No {typ} track. Check that bedfile is not empty, contains the correct chrom, and/or has correct columns."
         )
     return track, int(pos)
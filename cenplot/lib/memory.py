@@ -0,0 +1,114 @@
+"""
+Sampling of the resident set size (RSS) of this process.
+"""
+
+import os
+import sys
+import threading
+
+from contextlib import contextmanager
+from typing import Iterator
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def get_rss() -> int | None:
+    """
+    Get the current RSS of this process in bytes.
+    * Without `/proc`, this is the peak RSS of the process instead.
+    * `None` if neither `/proc` nor the `resource` module is available. ex. On Windows.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        pass
+
+    # Unix only.
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS. Kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRSS:
+    """
+    Peak RSS seen while sampling.
+    """
+
+    def __init__(self, rss: int) -> None:
+        self.start = rss
+        """
+        RSS in bytes when sampling started.
+        """
+        self.peak = rss
+        """
+        Peak RSS in bytes.
+        """
+
+
+class RSSSampler:
+    """
+    Samples the RSS of this process in a background thread and tracks the peak of each open window.
+    * Allocations shorter than `interval` may be missed.
+    * Check `RSSSampler.available` first. Otherwise, every window stays at `0`.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self._windows: list[PeakRSS] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def available() -> bool:
+        """
+        RSS can be sampled on this platform. See `get_rss`.
+        """
+        return get_rss() is not None
+
+    def _sample(self) -> None:
+        rss = get_rss()
+        if rss is None:
+            return
+        with self._lock:
+            for window in self._windows:
+                window.peak = max(window.peak, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    @contextmanager
+    def running(self) -> Iterator["RSSSampler"]:
+        """
+        Sample within this context.
+        """
+        self._stop.clear()
+        thread = threading.Thread(target=self._run, name="cenplot-rss", daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            self._stop.set()
+            thread.join()
+
+    def open(self) -> PeakRSS:
+        """
+        Start tracking the peak RSS from now.
+        """
+        window = PeakRSS(get_rss() or 0)
+        with self._lock:
+            self._windows.append(window)
+        return window
+
+    def close(self, window: PeakRSS) -> None:
+        """
+        Stop tracking the peak RSS of `window` after a final sample.
+        """
+        self._sample()
+        with self._lock:
+            self._windows.remove(window)
@@ -0,0 +1,247 @@
+"""
+Wall and CPU time of each stage of reading and plotting tracks.
+
+Stages:
+* `read`
+    * Reading a track from its file. Includes `transform`.
+* `transform`
+    * Deriving track data. ex. HOR array lengths or self-identity geometry.
+* `draw`
+    * Drawing a track on its axis.
+* `save`
+    * Solving the layout, rendering, and encoding output files. Includes `layout`.
+* `layout`
+    * Solving the figure layout.
+* `plot`
+    * Plotting all tracks of a chrom. Includes `draw` and `save`.
+* `merge`
+    * Merging plots of all chroms.
+
+Optionally, the peak resident set size (RSS) of the process during each stage is sampled.
+"""
+
+import json
+import time
+import logging
+import threading
+
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, NamedTuple, TextIO
+
+from .memory import RSSSampler
+
+
+class Timing(NamedTuple):
+    """
+    Time taken by a single stage.
+    """
+
+    stage: str
+    chrom: str | None
+    track: str | None
+    """
+    Index and type of track or the name of a transform. ex. `0:hor` or `hor_array_length`
+    """
+    wall: float
+    """
+    Wall time in seconds.
+    """
+    cpu: float
+    """
+    CPU time of the whole process in seconds. Includes other threads, like those of polars or concurrently read tracks.
+    """
+    rss_start: int | None = None
+    """
+    RSS of the process in bytes at the start of the stage. Only if sampling memory.
+    """
+    rss_peak: int | None = None
+    """
+    Peak RSS of the process in bytes during the stage. Only if sampling memory. Includes other threads.
+    """
+
+
+# Stages overlapping the time of another stage.
+NESTED_STAGES = {"transform", "layout", "plot"}
+
+# Timings of this process. Set by Timings.collect.
+_TIMINGS: "Timings | None" = None
+_TIMINGS_LOCK = threading.Lock()
+# Chrom of the innermost timed stage of each thread.
+_LOCAL = threading.local()
+
+
+class Timings:
+    """
+    Collects the time taken by each stage of `read_tracks` and `plot_tracks` in this process.
+
+    # Usage
+    ```python
+    import cenplot
+
+    timings = cenplot.Timings()
+    with timings.collect():
+        track_list, settings = cenplot.read_tracks(fh, chrom=chrom)
+        cenplot.plot_tracks(track_list.tracks, settings, "plots", chrom)
+    print(timings.summary())
+    ```
+    """
+
+    def __init__(self, memory: bool = False, memory_interval: float = 0.01) -> None:
+        """
+        # Args
+        * `memory`
+            * Also sample the peak RSS of each stage in a background thread.
+            * Not sampled if RSS isn't available on this platform. See `cenplot.lib.memory.get_rss`.
+        * `memory_interval`
+            * Seconds between RSS samples.
+        """
+        self.records: list[Timing] = []
+        self.sampler: RSSSampler | None = None
+        if memory and RSSSampler.available():
+            self.sampler = RSSSampler(memory_interval)
+        elif memory:
+            logging.warning(
+                "RSS isn't available on this platform. Not sampling memory."
+            )
+
+    @contextmanager
+    def collect(self) -> Iterator["Timings"]:
+        """
+        Record timings to this object within this context.
+        """
+        global _TIMINGS
+        with _TIMINGS_LOCK:
+            prev_timings, _TIMINGS = _TIMINGS, self
+        try:
+            if self.sampler:
+                with self.sampler.running():
+                    yield self
+            else:
+                yield self
+        finally:
+            with _TIMINGS_LOCK:
+                _TIMINGS = prev_timings
+
+    def extend(self, records: Iterable[Timing]) -> None:
+        """
+        Add timings recorded elsewhere. ex. In a worker process.
+        """
+        self.records.extend(Timing(*record) for record in records)
+
+    def totals(self, by: str = "stage") -> dict[str, dict[str, float]]:
+        """
+        Total wall and CPU time by `stage`, `chrom`, or `track`.
+        * Nested stages are only counted by `stage`.
+        """
+        totals: defaultdict[str, dict[str, float]] = defaultdict(
+            lambda: {"wall": 0.0, "cpu": 0.0}
+        )
+        for record in self.records:
+            key = getattr(record, by)
+            if key is None or (by != "stage" and record.stage in NESTED_STAGES):
+                continue
+            totals[str(key)]["wall"] += record.wall
+            totals[str(key)]["cpu"] += record.cpu
+        return dict(totals)
+
+    def peaks(self, by: str = "chrom") -> dict[str, int]:
+        """
+        Highest peak RSS in bytes by `stage`, `chrom`, or `track`. Empty if not sampling memory.
+        """
+        peaks: dict[str, int] = {}
+        for record in self.records:
+            key = getattr(record, by)
+            if key is None or record.rss_peak is None:
+                continue
+            peaks[str(key)] = max(peaks.get(str(key), 0), record.rss_peak)
+        return peaks
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "records": [record._asdict() for record in self.records],
+            "totals": {by: self.totals(by) for by in ("stage", "chrom", "track")},
+            "peak_rss": {by: self.peaks(by) for by in ("stage", "chrom", "track")},
+        }
+
+    def write_json(self, fh: TextIO) -> None:
+        json.dump(self.to_dict(), fh, indent=2)
+
+    def summary(self, n: int = 5) -> str:
+        """
+        Summarize total time by stage and the `n` slowest chroms and tracks.
+        """
+        lines = ["Total time by stage (wall, cpu):"]
+        for stage, total in self.totals("stage").items():
+            lines.append(f"  {stage}: {total['wall']:.2f}s, {total['cpu']:.2f}s")
+
+        for by in ("chrom", "track"):
+            slowest = sorted(
+                self.totals(by).items(), key=lambda item: item[1]["wall"], reverse=True
+            )[:n]
+            if not slowest:
+                continue
+            lines.append(f"Slowest {by}s (wall, cpu):")
+            for key, total in slowest:
+                lines.append(f"  {key}: {total['wall']:.2f}s, {total['cpu']:.2f}s")
+
+        records = sorted(self.records, key=lambda record: record.wall, reverse=True)
+        if records:
+            lines.append("Slowest stages (wall, cpu):")
+            for record in records[:n]:
+                label = " ".join(
+                    str(elem)
+                    for elem in (record.stage, record.chrom, record.track)
+                    if elem is not None
+                )
+                lines.append(f"  {label}: {record.wall:.2f}s, {record.cpu:.2f}s")
+
+        for by in ("chrom", "track"):
+            highest = sorted(
+                self.peaks(by).items(), key=lambda item: item[1], reverse=True
+            )[:n]
+            if not highest:
+                continue
+            lines.append(f"Highest peak RSS by {by}:")
+            for key, peak in highest:
+                lines.append(f"  {key}: {peak / 2**20:.1f} MiB")
+        return "\n".join(lines)
+
+
+@contextmanager
+def timed(
+    stage: str, *, chrom: str | None = None, track: str | None = None
+) -> Iterator[None]:
+    """
+    Record the time taken within this context if collecting timings. See `Timings.collect`.
+    * If no `chrom`, use that of the enclosing stage in this thread.
+    """
+    timings = _TIMINGS
+    if timings is None:
+        yield
+        return
+
+    prev_chrom = getattr(_LOCAL, "chrom", None)
+    chrom = chrom if chrom is not None else prev_chrom
+    _LOCAL.chrom = chrom
+    sampler = timings.sampler
+    window = sampler.open() if sampler else None
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        if sampler and window:
+            sampler.close(window)
+        _LOCAL.chrom = prev_chrom
+        timings.records.append(
+            Timing(
+                stage,
+                chrom,
+                track,
+                wall,
+                cpu,
+                window.start if window else None,
+                window.peak if window else None,
+            )
+        )
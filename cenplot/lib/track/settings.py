@@ -375,6 +375,7 @@ class HORTrackSettings(DefaultTrackSettings):
     color_map_file: str | None = None
     """
     Monomer color map TSV file. Two column headerless file that has `mode` to `color` mapping.
+    * In `mer` mode, monomers not in the file keep their default color.
     """
     use_item_rgb: bool = False
     """
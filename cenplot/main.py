@@ -1,17 +1,23 @@
+import os
 import argparse
-from matplotlib import rcParams
-from .cli.draw import add_draw_cli, draw
-
-rcParams["pdf.use14corefonts"] = True
-rcParams["text.usetex"] = False
+from .cli.draw import add_draw_cli, draw, set_rc_params
+from .cli.batch import add_batch_cli, batch
+from .cli.serve import add_serve_cli, serve
+from .lib.defaults import CACHE_DIR_ENV
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Centromere ploting library.")
     sub_ap = ap.add_subparsers(dest="cmd")
     add_draw_cli(sub_ap)
+    add_batch_cli(sub_ap)
+    add_serve_cli(sub_ap)
 
     args = ap.parse_args()
+    set_rc_params()
+    if getattr(args, "cache_dir", None):
+        # Inherited by worker processes.
+        os.environ[CACHE_DIR_ENV] = args.cache_dir
 
     if args.cmd == "draw":
         return draw(
@@ -21,6 +27,35 @@ def main() -> int:
             args.outfile,
             args.share_xlim,
             args.processes,
+            args.template,
+            args.preview,
+            args.max_merged_pixels,
+            args.max_in_flight,
+            args.watch,
+            args.watch_interval,
+            args.resume,
+            args.timings,
+            args.memory,
+            args.dry_run,
+        )
+    elif args.cmd == "batch":
+        return batch(
+            args.manifest,
+            args.outdir,
+            args.summary,
+            args.processes,
+            args.max_in_flight,
+            args.template,
+            args.preview,
+        )
+    elif args.cmd == "serve":
+        return serve(
+            args.host,
+            args.port,
+            args.outdir,
+            args.processes,
+            args.cache_size,
+            args.template,
         )
     else:
         raise ValueError(f"Not a valid command ({args.cmd})")
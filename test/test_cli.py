@@ -1,7 +1,18 @@
+import os
+import re
 import gzip
+import json
+import time
 import pytest
+import shutil
 import subprocess
 import tempfile
+import urllib.request
+import numpy as np
+
+from PIL import Image
+from pypdf import PdfReader
+from matplotlib.testing.compare import compare_images
 
 
 # Not perfect. Just need to check nothing crashes.
@@ -93,3 +104,810 @@ def test_cli_draw_subset(track_file, ctg_file):
             ],
             check=True,
         )
+
+
+@pytest.mark.parametrize(
+    ["track_file", "chroms", "args"],
+    [
+        # Reuse figure across chroms.
+        (
+            "examples/tracks_bar_label.toml",
+            ["haplotype1-0000003", "haplotype1-0000003:1000000-2000000"],
+            ["--template"],
+        ),
+        # Shared x-axis limits from workers.
+        (
+            "examples/tracks_bar_label.toml",
+            ["haplotype1-0000003", "haplotype1-0000003:1000000-2000000"],
+            ["--share_xlim"],
+        ),
+        # One chrom submitted at a time.
+        (
+            "examples/tracks_bar_label.toml",
+            ["haplotype1-0000003", "haplotype1-0000003:1000000-2000000"],
+            ["--max_in_flight", "1"],
+        ),
+        # Low resolution preview with decimated HOR track.
+        (
+            "examples/tracks_strand.toml",
+            ["chm13_chr1:121119216-127324115"],
+            ["--preview"],
+        ),
+        # Low resolution preview with binned self-identity track.
+        (
+            "examples/tracks_selfident.toml",
+            ["HG00731_chrY_haplotype2-0000041:9700692-11101963"],
+            ["--preview"],
+        ),
+        # Custom HOR color map.
+        (
+            "test/tracks_hor_color_map.toml",
+            ["chm13_chr10:38568472-42561808"],
+            [],
+        ),
+        # Render png in strips.
+        (
+            "test/tracks_tiled.toml",
+            ["haplotype1-0000003"],
+            [],
+        ),
+    ],
+)
+def test_cli_draw_options(track_file: str, chroms: list[str], args: list[str]):
+    prefix = str(hash(track_file + "".join(args)))
+    with tempfile.TemporaryDirectory(prefix=prefix) as tmp_dir:
+        _ = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                track_file,
+                "-c",
+                *chroms,
+                "-d",
+                tmp_dir,
+                "-o",
+                os.path.join(tmp_dir, "merged.png"),
+                "-p",
+                "2",
+                *args,
+            ],
+            check=True,
+        )
+        assert os.path.exists(os.path.join(tmp_dir, "merged.png"))
+
+
+def test_cli_draw_merge_shards():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _ = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                "examples/tracks_bar_label.toml",
+                "-c",
+                "haplotype1-0000003",
+                "haplotype1-0000003:1000000-2000000",
+                "-d",
+                tmp_dir,
+                "-o",
+                os.path.join(tmp_dir, "merged.png"),
+                "-p",
+                "2",
+                # One 9600x3600 image per shard.
+                "--max_merged_pixels",
+                "40000000",
+            ],
+            check=True,
+        )
+        # Every shard keeps the resolution of the plots.
+        with Image.open(os.path.join(tmp_dir, "haplotype1-0000003.png")) as img:
+            dpi = img.info["dpi"]
+        for shard in ("merged_1.png", "merged_2.png"):
+            with Image.open(os.path.join(tmp_dir, shard)) as img:
+                assert img.info["dpi"] == pytest.approx(dpi)
+
+
+def test_merge_pngs_empty():
+    from cenplot import merge_pngs
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outfile = os.path.join(tmp_dir, "merged.png")
+        with pytest.raises(ValueError):
+            merge_pngs([], outfile)
+        assert not os.path.exists(outfile)
+
+
+@pytest.mark.parametrize(
+    ["track_file", "chrom", "tol"],
+    [
+        # Rectangles.
+        ("test/tracks_tiled.toml", "haplotype1-0000003", None),
+        # Lines.
+        ("test/tracks_tiled_line.toml", "haplotype1-0000003", 2.0),
+        # Arrows.
+        ("examples/tracks_strand.toml", "chm13_chr1:121119216-127324115", 2.0),
+        # Polygons.
+        (
+            "examples/tracks_selfident.toml",
+            "HG00731_chrY_haplotype2-0000041:9700692-11101963",
+            None,
+        ),
+    ],
+)
+def test_cli_draw_tiled_same_as_untiled(track_file: str, chrom: str, tol: float | None):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(track_file, "rt") as fh:
+            lines = [
+                line
+                for line in fh
+                if not line.startswith("max_tile_pixels") and not line.startswith("dpi")
+            ]
+        settings_idx = lines.index("[settings]\n") + 1
+
+        images = []
+        for name, settings in (
+            ("tiled", ["dpi = 150\n", "max_tile_pixels = 200000\n"]),
+            ("untiled", ["dpi = 150\n"]),
+        ):
+            tiled_track_file = os.path.join(tmp_dir, f"tracks_{name}.toml")
+            with open(tiled_track_file, "wt") as fh:
+                fh.writelines([*lines[:settings_idx], *settings, *lines[settings_idx:]])
+
+            outdir = os.path.join(tmp_dir, name)
+            _ = subprocess.run(
+                [
+                    "python",
+                    "-m",
+                    "cenplot.main",
+                    "draw",
+                    "-t",
+                    tiled_track_file,
+                    "-c",
+                    chrom,
+                    "-d",
+                    outdir,
+                    "-p",
+                    "1",
+                ],
+                check=True,
+            )
+            images.append(os.path.join(outdir, f"{chrom}.png"))
+
+        if tol is None:
+            with Image.open(images[0]) as tiled, Image.open(images[1]) as untiled:
+                assert np.array_equal(np.asarray(tiled), np.asarray(untiled))
+        else:
+            # Lines are simplified from where they enter each strip so may differ slightly.
+            assert compare_images(images[1], images[0], tol) is None
+
+
+def test_figure_template_reset_ax():
+    import matplotlib.pyplot as plt
+
+    from cenplot.lib.draw.template import reset_ax
+
+    def tick_state(ax):
+        fig.canvas.draw()
+        tick = ax.xaxis.get_major_ticks()[0]
+        ytick = ax.yaxis.get_major_ticks()[0]
+        return (
+            tick.label1.get_fontsize(),
+            tick.tick1line.get_markersize(),
+            tick.tick2line.get_visible(),
+            ytick.tick2line.get_visible(),
+            tick.gridline.get_visible(),
+        )
+
+    fig, ax = plt.subplots()
+    default = tick_state(ax)
+
+    # Formatted as by a previous config.
+    ax.grid(True)
+    ax.tick_params(axis="both", which="both", length=10, labelsize=20)
+    ax.set_xticks([0.0, 0.5, 1.0], ["0", "0.5", "1"], fontsize=30)
+
+    reset_ax(ax)
+    assert tick_state(ax) == default
+    plt.close(fig)
+
+
+def test_cli_draw_merge_pdf():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outfile = os.path.join(tmp_dir, "merged.pdf")
+        _ = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                "examples/tracks_bar_label.toml",
+                "-c",
+                "haplotype1-0000003",
+                "haplotype1-0000003:1000000-2000000",
+                "-d",
+                tmp_dir,
+                "-o",
+                outfile,
+                "-p",
+                "2",
+            ],
+            check=True,
+        )
+        # Pages are the same as the pdf of each chrom in order.
+        merged = PdfReader(outfile)
+        assert len(merged.pages) == 2
+        for page, chrom in zip(
+            merged.pages, ["haplotype1-0000003", "haplotype1-0000003:1000000-2000000"]
+        ):
+            (src_page,) = PdfReader(os.path.join(tmp_dir, f"{chrom}.pdf")).pages
+            assert page.mediabox == src_page.mediabox
+            assert page.get_contents().get_data() == src_page.get_contents().get_data()
+
+
+def test_merge_pdfs():
+    import matplotlib
+
+    matplotlib.use("agg")
+    import matplotlib.pyplot as plt
+    from cenplot import merge_pdfs
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        infiles = []
+        labels = ["1 0 R", "2 0 obj", "stream"]
+        for i, label in enumerate(labels):
+            # Text that looks like PDF syntax is kept as is.
+            fig, ax = plt.subplots(figsize=(2 + i, 2))
+            ax.set_title(label)
+            infile = os.path.join(tmp_dir, f"{i}.pdf")
+            fig.savefig(infile, metadata={"Title": f"plot {i}"})
+            plt.close(fig)
+            infiles.append(infile)
+
+        outfile = os.path.join(tmp_dir, "merged.pdf")
+        assert merge_pdfs(infiles, outfile) == [outfile]
+        merged = PdfReader(outfile)
+        assert len(merged.pages) == 3
+        assert [float(page.mediabox.width) for page in merged.pages] == [
+            144.0,
+            216.0,
+            288.0,
+        ]
+        assert merged.metadata and merged.metadata.title == "plot 0"
+        for page, infile, label in zip(merged.pages, infiles, labels):
+            (src_page,) = PdfReader(infile).pages
+            assert label in page.extract_text()
+            assert page.extract_text() == src_page.extract_text()
+
+        with pytest.raises(ValueError):
+            merge_pdfs([], os.path.join(tmp_dir, "empty.pdf"))
+
+
+def test_cli_draw_resume():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outfile = os.path.join(tmp_dir, "merged.png")
+        cmd = [
+            "python",
+            "-m",
+            "cenplot.main",
+            "draw",
+            "-t",
+            "examples/tracks_bar_label.toml",
+            "-c",
+            "haplotype1-0000003",
+            "haplotype1-0000003:1000000-2000000",
+            "-d",
+            tmp_dir,
+            "-o",
+            outfile,
+            "-p",
+            "1",
+            "--resume",
+        ]
+        # Nothing is recorded without --resume.
+        _ = subprocess.run(cmd[:-1], check=True, capture_output=True)
+        assert not os.path.exists(os.path.join(tmp_dir, ".cenplot_manifest.jsonl"))
+
+        first = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        assert "Skipped" not in first.stderr
+        os.remove(outfile)
+
+        # Chroms are up to date so only the merged plot is rebuilt.
+        second = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        assert second.stderr.count("Skipped") == 2
+        assert os.path.exists(outfile)
+
+        # Changed options are redrawn.
+        third = subprocess.run(
+            [*cmd, "--share_xlim"], check=True, capture_output=True, text=True
+        )
+        assert "Skipped" not in third.stderr
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+def test_cli_draw_share_xlim_read_once(processes: str):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        timings = os.path.join(tmp_dir, "timings.json")
+        cmd = [
+            "python",
+            "-m",
+            "cenplot.main",
+            "draw",
+            "-t",
+            "examples/tracks_bar_label.toml",
+            "-c",
+            "haplotype1-0000003",
+            "haplotype1-0000003:1000000-2000000",
+            "-d",
+            tmp_dir,
+            "-p",
+            processes,
+            "--share_xlim",
+            "--resume",
+            "--timings",
+            timings,
+        ]
+
+        def get_reads() -> list[tuple[str, str]]:
+            with open(timings, "rt") as fh:
+                records = json.load(fh)["records"]
+            return [
+                (record["chrom"], record["track"])
+                for record in records
+                if record["stage"] == "read"
+            ]
+
+        _ = subprocess.run(cmd, check=True, capture_output=True)
+        # Tracks used to share limits are plotted without reading them again.
+        reads = get_reads()
+        assert reads and len(reads) == len(set(reads))
+
+        # Up to date chroms aren't read to share limits.
+        second = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        assert second.stderr.count("Skipped") == 2
+        assert not get_reads()
+
+
+@pytest.mark.parametrize(
+    ["track_file", "chrom"],
+    [
+        ("examples/tracks_bar_label.toml", "haplotype1-0000003"),
+        ("test/tracks_hor_color_map.toml", "chm13_chr10:38568472-42561808"),
+    ],
+)
+def test_read_tracks_threads(track_file: str, chrom: str):
+    from cenplot import read_tracks
+
+    tracks = {}
+    for threads in (1, 4):
+        with open(track_file, "rb") as fh:
+            tracks[threads] = read_tracks(fh, chrom=chrom, threads=threads)
+
+    (serial, serial_settings), (threaded, threaded_settings) = tracks.values()
+    # Same tracks in the same order.
+    assert [(trk.title, trk.opt) for trk in threaded.tracks] == [
+        (trk.title, trk.opt) for trk in serial.tracks
+    ]
+    for trk_threaded, trk_serial in zip(threaded.tracks, serial.tracks):
+        assert trk_threaded.data.equals(trk_serial.data)
+    assert threaded.chroms == serial.chroms
+    assert threaded_settings == serial_settings
+
+
+def test_cli_draw_cache_dir():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = os.path.join(tmp_dir, "tracks.toml")
+        cache_dir = os.path.join(tmp_dir, "cache")
+        with open(config, "wt") as fh:
+            fh.write(
+                "[[tracks]]\n"
+                'position = "relative"\n'
+                'type = "horort"\n'
+                "proportion = 1.0\n"
+                'path = "examples/data/hor/stv.bed.gz"\n'
+            )
+        outfiles = []
+        for i in range(2):
+            outfile = os.path.join(tmp_dir, f"{i}.png")
+            _ = subprocess.run(
+                [
+                    "python",
+                    "-m",
+                    "cenplot.main",
+                    "draw",
+                    "-t",
+                    config,
+                    "-c",
+                    "chm13_chr10:38568472-42561808",
+                    "-d",
+                    os.path.join(tmp_dir, str(i)),
+                    "-o",
+                    outfile,
+                    "-p",
+                    "1",
+                    "--cache_dir",
+                    cache_dir,
+                ],
+                check=True,
+            )
+            outfiles.append(outfile)
+
+        assert os.listdir(os.path.join(cache_dir, "hor_array_length"))
+        # Cached HOR array lengths are drawn the same.
+        with open(outfiles[0], "rb") as fh_1, open(outfiles[1], "rb") as fh_2:
+            assert fh_1.read() == fh_2.read()
+
+
+def test_cli_draw_cached_stats():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cmd = [
+            "python",
+            "-m",
+            "cenplot.main",
+            "draw",
+            "-t",
+            "examples/tracks_bar_label.toml",
+            "-c",
+            "haplotype1-0000003",
+            "missing_chrom",
+            "-d",
+            tmp_dir,
+            "-p",
+            "1",
+            "--share_xlim",
+        ]
+        # Statistics of each track are cached so no data is read to share limits or to skip chrom with no data.
+        cache_cmd = [*cmd, "--cache_dir", os.path.join(tmp_dir, "cache")]
+        _ = subprocess.run(cache_cmd, check=True, capture_output=True)
+        second = subprocess.run(cache_cmd, check=True, capture_output=True, text=True)
+        assert "Skipped missing_chrom" in second.stderr
+        assert "Sharing x-axis limits from cached track statistics" in second.stderr
+
+
+@pytest.mark.parametrize("processes", ["1", "2"])
+@pytest.mark.parametrize("share_xlim", [True, False])
+def test_cli_draw_skip_empty_chrom(processes: str, share_xlim: bool):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outfile = os.path.join(tmp_dir, "merged.png")
+        proc = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                "examples/tracks_bar_label.toml",
+                "-c",
+                "missing_chrom",
+                "haplotype1-0000003",
+                "-d",
+                tmp_dir,
+                "-o",
+                outfile,
+                "-p",
+                processes,
+                *(["--share_xlim"] if share_xlim else []),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        # Chrom with no data is dropped once read by the worker without a cache dir.
+        assert "Skipped missing_chrom" in proc.stderr
+        assert not os.path.exists(os.path.join(tmp_dir, "missing_chrom.png"))
+        with (
+            Image.open(outfile) as merged,
+            Image.open(os.path.join(tmp_dir, "haplotype1-0000003.png")) as plot,
+        ):
+            assert merged.size == plot.size
+
+
+def test_cli_draw_timings():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        timings = os.path.join(tmp_dir, "timings.json")
+        proc = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                "examples/tracks_bar_label.toml",
+                "-c",
+                "haplotype1-0000003",
+                "haplotype1-0000003:1000000-2000000",
+                "-d",
+                tmp_dir,
+                "-o",
+                os.path.join(tmp_dir, "merged.png"),
+                "-p",
+                "2",
+                "--timings",
+                timings,
+                "--memory",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        assert "Total time by stage" in proc.stderr
+        with open(timings, "rt") as fh:
+            report = json.load(fh)
+        # Stages recorded in workers are included.
+        assert {"read", "draw", "layout", "save", "merge"}.issubset(
+            report["totals"]["stage"]
+        )
+        assert set(report["totals"]["chrom"]) == {
+            "haplotype1-0000003",
+            "haplotype1-0000003:1000000-2000000",
+        }
+        # Peak memory sampled in workers.
+        assert set(report["peak_rss"]["chrom"]) == set(report["totals"]["chrom"])
+        assert all(
+            record["rss_peak"] >= record["rss_start"] > 0
+            for record in report["records"]
+        )
+
+
+def test_timings_memory_unavailable(monkeypatch):
+    import sys
+    import builtins
+    import importlib
+
+    # No resource module or /proc, as on Windows.
+    monkeypatch.setitem(sys.modules, "resource", None)
+    real_open = builtins.open
+
+    def open_no_proc(file, *args, **kwargs):
+        if str(file).startswith("/proc"):
+            raise FileNotFoundError(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", open_no_proc)
+
+    import cenplot.lib.memory
+
+    memory = importlib.reload(cenplot.lib.memory)
+    assert memory.get_rss() is None
+
+    from cenplot import Timings
+    from cenplot.lib.timing import timed
+
+    timings = Timings(memory=True)
+    assert timings.sampler is None
+    with timings.collect():
+        with timed("plot"):
+            pass
+    assert timings.records[0].rss_peak is None
+
+
+def test_cli_draw_dry_run():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outdir = os.path.join(tmp_dir, "plots")
+        proc = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "draw",
+                "-t",
+                "examples/tracks_bar_label.toml",
+                "-c",
+                "haplotype1-0000003",
+                "-d",
+                outdir,
+                "--dry_run",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        # Nothing is drawn.
+        assert not os.path.exists(outdir)
+
+        header, *rows = [line.split("\t") for line in proc.stdout.splitlines()]
+        estimates = {row[1]: dict(zip(header, row)) for row in rows}
+        assert list(estimates) == ["0:label", "1:bar", "total"]
+        assert int(estimates["1:bar"]["rows"]) > 0
+        assert int(estimates["total"]["rows"]) == sum(
+            int(estimates[track]["rows"]) for track in ("0:label", "1:bar")
+        )
+        # 16 x 6 inches at 600 dpi.
+        assert (estimates["total"]["width"], estimates["total"]["height"]) == (
+            "9600",
+            "3600",
+        )
+
+
+def test_cli_batch():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manifest = os.path.join(tmp_dir, "manifest.tsv")
+        summary = os.path.join(tmp_dir, "summary.tsv")
+        with open(manifest, "wt") as fh:
+            fh.write("config\tchrom\toutdir\n")
+            fh.write("examples/tracks_bar_label.toml\thaplotype1-0000003\t\n")
+            fh.write(
+                f"examples/tracks_bar_label.toml\thaplotype1-0000003:1000000-2000000\t{tmp_dir}/sub\n"
+            )
+            fh.write("missing.toml\thaplotype1-0000003\t\n")
+
+        # Exits with an error if any job fails.
+        proc = subprocess.run(
+            [
+                "python",
+                "-m",
+                "cenplot.main",
+                "batch",
+                "-m",
+                manifest,
+                "-d",
+                tmp_dir,
+                "-s",
+                summary,
+                "-p",
+                "2",
+            ],
+        )
+        assert proc.returncode == 1
+        assert os.path.exists(os.path.join(tmp_dir, "haplotype1-0000003.png"))
+        assert os.path.exists(
+            os.path.join(tmp_dir, "sub", "haplotype1-0000003:1000000-2000000.png")
+        )
+        with open(summary, "rt") as fh:
+            status = [line.split("\t")[3] for line in fh.readlines()[1:]]
+        assert status == ["ok", "ok", "failed"]
+
+
+def test_cli_serve():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log = os.path.join(tmp_dir, "serve.log")
+        with open(log, "wt") as fh:
+            proc = subprocess.Popen(
+                ["python", "-m", "cenplot.main", "serve", "--port", "0", "-p", "1"],
+                stderr=fh,
+            )
+        try:
+            # Wait for server to bind to a free port.
+            port = None
+            for _ in range(120):
+                with open(log, "rt") as fh:
+                    res = re.search(r"Serving on http://[\d.]+:(\d+)", fh.read())
+                if res:
+                    port = int(res.group(1))
+                    break
+                time.sleep(1)
+            assert port
+
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/render",
+                data=json.dumps(
+                    {
+                        "config": "examples/tracks_bar_label.toml",
+                        "chrom": "haplotype1-0000003",
+                        "overrides": {"dpi": 50},
+                    }
+                ).encode(),
+            )
+            with urllib.request.urlopen(request) as response:
+                assert response.headers["Content-Type"] == "image/png"
+                assert response.read().startswith(b"\x89PNG")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def test_cli_import_time():
+    # Plotting dependencies should only be imported when a command needs them.
+    proc = subprocess.run(
+        [
+            "python",
+            "-c",
+            (
+                "import sys, time\n"
+                "start = time.perf_counter()\n"
+                "import cenplot.main\n"
+                "print(time.perf_counter() - start)\n"
+                "print(','.join(sorted(m for m in ('matplotlib', 'polars', 'numpy', 'censtats', 'intervaltree', 'yaml') if m in sys.modules)))\n"
+            ),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    import_time, heavy_modules = proc.stdout.splitlines()
+    assert heavy_modules == "", (
+        f"Imported {heavy_modules} with cenplot.main in {float(import_time):.3f}s"
+    )
+    subprocess.run(
+        ["python", "-m", "cenplot.main", "--help"], check=True, capture_output=True
+    )
+
+
+def test_all_names_resolve():
+    import ast
+    import cenplot
+
+    assert len(cenplot.__all__) == len(set(cenplot.__all__))
+    for name in cenplot.__all__:
+        assert getattr(cenplot, name) is not None, name
+
+    # Names imported for type checkers are the same as the public names.
+    with open(cenplot.__file__, "rt") as fh:
+        module = ast.parse(fh.read())
+    (type_checking,) = [
+        node
+        for node in module.body
+        if isinstance(node, ast.If) and ast.unparse(node.test) == "TYPE_CHECKING"
+    ]
+    type_checking_names = {
+        alias.name
+        for node in type_checking.body
+        if isinstance(node, ast.ImportFrom)
+        for alias in node.names
+    }
+    assert type_checking_names == set(cenplot.__all__)
+
+
+def test_cli_draw_watch():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cdr_file = os.path.join(tmp_dir, "cdr.bed.gz")
+        shutil.copy("examples/data/bar_label/cdr.bed.gz", cdr_file)
+        track_file = os.path.join(tmp_dir, "tracks.toml")
+        with open("examples/tracks_bar_label.toml", "rt") as fh:
+            config = fh.read()
+        with open(track_file, "wt") as fh:
+            fh.write(
+                config.replace("dpi = 600", "dpi = 50").replace(
+                    "examples/data/bar_label/cdr.bed.gz", cdr_file
+                )
+            )
+
+        log = os.path.join(tmp_dir, "watch.log")
+
+        def wait_for_log(pattern: str, count: int) -> None:
+            for _ in range(120):
+                with open(log, "rt") as fh:
+                    if len(re.findall(pattern, fh.read())) >= count:
+                        return
+                time.sleep(1)
+            raise TimeoutError(pattern)
+
+        with open(log, "wt") as fh:
+            proc = subprocess.Popen(
+                [
+                    "python",
+                    "-m",
+                    "cenplot.main",
+                    "draw",
+                    "-t",
+                    track_file,
+                    "-c",
+                    "haplotype1-0000003:6000000-7000000",
+                    "haplotype1-0000003:8000000-9000000",
+                    "-d",
+                    tmp_dir,
+                    "-o",
+                    os.path.join(tmp_dir, "merged.png"),
+                    "--watch",
+                    "--watch_interval",
+                    "0.2",
+                ],
+                stderr=fh,
+            )
+        try:
+            wait_for_log(r"Redrew 2 chroms", 1)
+            # Only the first region has CDRs.
+            with gzip.open(cdr_file, "at") as fh:
+                fh.write("haplotype1-0000003\t6600000\t6650000\n")
+            wait_for_log(r"Redrew \d+ chroms", 2)
+            with open(log, "rt") as fh:
+                assert re.findall(r"Redrew (\d+) chroms", fh.read()) == ["2", "1"]
+            assert os.path.exists(os.path.join(tmp_dir, "merged.png"))
+        finally:
+            proc.terminate()
+            proc.wait()
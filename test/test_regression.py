@@ -0,0 +1,249 @@
+"""
+Regression tests of the plots and track data of each example against stored references, and of optimized render paths against the default one.
+
+References are in `test/reference`. After an intended change to plots or track data, regenerate them with:
+```bash
+CENPLOT_UPDATE_REFERENCES=1 python -m pytest test/test_regression.py
+```
+"""
+
+import os
+import copy
+import gzip
+import dataclasses
+import functools
+
+import pytest
+import polars as pl
+
+from matplotlib.testing.compare import compare_images
+from polars.testing import assert_frame_equal
+
+import cenplot
+from cenplot.cli.draw import set_rc_params
+from cenplot.lib.io.tracks import get_track_files, load_config
+
+REFERENCE_DIR = os.path.join("test", "reference")
+UPDATE_ENV = "CENPLOT_UPDATE_REFERENCES"
+SLOW_ENV = "CENPLOT_SLOW_TESTS"
+# Fixed dpi so references are small and don't depend on each config.
+DPI = 50
+# RMS of pixel differences out of 255. Allows for differences in font rendering between platforms.
+IMAGE_TOL = 2.0
+LFS_POINTER_PREFIX = b"version https://git-lfs"
+
+# Track file and chrom or a file whose first column of the first line is the chrom.
+CASES = [
+    ("examples/tracks_bar_label.toml", "haplotype1-0000003"),
+    pytest.param(
+        "examples/tracks_hor.toml",
+        "chm13_chr10:38568472-42561808",
+        marks=pytest.mark.xfail(
+            reason="border is not a HOR track option.", raises=TypeError
+        ),
+    ),
+    pytest.param(
+        "examples/tracks_hor_gray_bg.toml",
+        "chm13_chr10:38568472-42561808",
+        marks=pytest.mark.skipif(
+            not os.environ.get(SLOW_ENV),
+            reason=f"Draws ~300 split HOR tracks. Set {SLOW_ENV}=1 to run.",
+        ),
+    ),
+    ("examples/tracks_line.toml", None),
+    (
+        "examples/tracks_local_selfident.toml",
+        "HG00096_chr1_haplotype1-0000018:1000000-3000000",
+    ),
+    (
+        "examples/tracks_selfident.toml",
+        "HG00731_chrY_haplotype2-0000041:9700692-11101963",
+    ),
+    ("examples/tracks_selfident_custom_scale.toml", "chr1_h1:86865001-102805000"),
+    ("examples/tracks_strand.toml", "chm13_chr1:121119216-127324115"),
+    ("test/tracks_cdr.toml", "test/cdr/HG02953_cdr.bed"),
+    ("test/tracks_chr1.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_hor_color_map.toml", "chm13_chr10:38568472-42561808"),
+    ("test/tracks_mon.yaml", "test/mon/stv.bed.gz"),
+    ("test/tracks_multiple.toml", "test/chrY/cdrs.bed"),
+    ("test/tracks_multiple_adj_ht.toml", "test/chrY/cdrs.bed"),
+    ("test/tracks_multiple_legend_top.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_simple.toml", "test/chrY/cdrs.bed"),
+    ("test/tracks_simple.yaml", "test/chrY/cdrs.bed"),
+    ("test/tracks_simple_empty_bed.toml", "test/chrY/cdrs.bed"),
+    ("test/tracks_simple_overlap.toml", "test/chrY/cdrs.bed"),
+    ("test/tracks_split_hor.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_split_hor_sort_by_order.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_split_hor_sort_by_order_fill.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_split_hor_sort_by_order_fill_only.toml", "test/chr1/cdrs.bed"),
+    ("test/tracks_tiled.toml", "haplotype1-0000003"),
+]
+
+
+def is_lfs_pointer(path: str) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(len(LFS_POINTER_PREFIX)) == LFS_POINTER_PREFIX
+
+
+def skip_if_unavailable(path: str) -> None:
+    if not os.path.exists(path):
+        pytest.skip(f"{path} doesn't exist.")
+    if is_lfs_pointer(path):
+        pytest.skip(f"{path} hasn't been pulled from Git LFS.")
+
+
+def get_chrom(chrom: str | None) -> str | None:
+    # Chrom names don't contain path separators.
+    if not chrom or os.sep not in chrom:
+        return chrom
+    skip_if_unavailable(chrom)
+    with gzip.open(chrom, "rt") if chrom.endswith(".gz") else open(chrom, "rt") as fh:
+        return fh.readline().split("\t")[0]
+
+
+@functools.cache
+def _read_case(track_file: str, chrom: str | None):
+    with open(track_file, "rb") as fh:
+        return cenplot.read_tracks(fh, chrom=chrom)
+
+
+def read_case(
+    track_file: str, chrom: str | None
+) -> tuple[list[cenplot.Track], cenplot.PlotSettings]:
+    """
+    Read the tracks of a case once per session. Returns copies so drawing doesn't modify them.
+    """
+    with open(track_file, "rb") as fh:
+        for track in load_config(fh).get("tracks", []):
+            if track.get("path"):
+                skip_if_unavailable(track["path"])
+            for file in get_track_files(track):
+                skip_if_unavailable(file)
+
+    track_list, settings = _read_case(track_file, get_chrom(chrom))
+    tracks = [
+        dataclasses.replace(track, options=copy.copy(track.options))
+        for track in track_list.tracks
+    ]
+    return tracks, dataclasses.replace(settings, dpi=DPI, format="png")
+
+
+def render(
+    tracks: list[cenplot.Track],
+    settings: cenplot.PlotSettings,
+    outdir: str,
+    **kwargs,
+) -> str:
+    set_rc_params()
+    _, _, files = cenplot.plot_tracks(tracks, settings, outdir, "plot", **kwargs)
+    return files[0]
+
+
+def get_reference_dir(track_file: str) -> str:
+    # ex. test/reference/examples_tracks_hor.toml
+    return os.path.join(REFERENCE_DIR, track_file.replace(os.sep, "_"))
+
+
+def get_track_names(tracks: list[cenplot.Track]) -> list[str]:
+    return [f"{idx}_{track.opt}" for idx, track in enumerate(tracks)]
+
+
+def assert_same_image(expected: str, actual: str, tol: float = IMAGE_TOL) -> None:
+    """
+    Assert two images differ by at most an RMS of `tol`. A diff image is written next to `actual` if not.
+    """
+    err = compare_images(expected, actual, tol)
+    assert err is None, err
+
+
+def assert_same_tracks(
+    expected: list[cenplot.Track], actual: list[cenplot.Track]
+) -> None:
+    assert get_track_names(expected) == get_track_names(actual)
+    for trk_expected, trk_actual in zip(expected, actual):
+        assert_frame_equal(trk_expected.data, trk_actual.data)
+
+
+@pytest.mark.parametrize(["track_file", "chrom"], CASES)
+def test_reference_tracks(track_file: str, chrom: str | None):
+    tracks, _ = read_case(track_file, chrom)
+    ref_dir = get_reference_dir(track_file)
+    if os.environ.get(UPDATE_ENV):
+        os.makedirs(ref_dir, exist_ok=True)
+        for file in os.listdir(ref_dir):
+            if file.endswith(".arrow"):
+                os.remove(os.path.join(ref_dir, file))
+        for name, track in zip(get_track_names(tracks), tracks):
+            track.data.write_ipc(
+                os.path.join(ref_dir, f"{name}.arrow"), compression="zstd"
+            )
+        return
+    if not os.path.exists(ref_dir):
+        pytest.skip(f"No reference for {track_file}. Set {UPDATE_ENV}=1 to add one.")
+
+    ref_names = sorted(
+        os.path.splitext(file)[0]
+        for file in os.listdir(ref_dir)
+        if file.endswith(".arrow")
+    )
+    assert sorted(get_track_names(tracks)) == ref_names
+    for name, track in zip(get_track_names(tracks), tracks):
+        df_ref = pl.read_ipc(os.path.join(ref_dir, f"{name}.arrow"))
+        assert_frame_equal(df_ref, track.data)
+
+
+@pytest.mark.parametrize(["track_file", "chrom"], CASES)
+def test_reference_plot(track_file: str, chrom: str | None, tmp_path):
+    tracks, settings = read_case(track_file, chrom)
+    ref_dir = get_reference_dir(track_file)
+    ref_file = os.path.join(ref_dir, "plot.png")
+    if os.environ.get(UPDATE_ENV):
+        os.makedirs(ref_dir, exist_ok=True)
+        render(tracks, settings, ref_dir)
+        return
+    if not os.path.exists(ref_file):
+        pytest.skip(f"No reference for {track_file}. Set {UPDATE_ENV}=1 to add one.")
+
+    assert_same_image(ref_file, render(tracks, settings, str(tmp_path)))
+
+
+@pytest.mark.parametrize(["track_file", "chrom"], CASES)
+def test_optimized_paths(track_file: str, chrom: str | None, tmp_path):
+    tracks, settings = read_case(track_file, chrom)
+    default = render(tracks, settings, str(tmp_path / "default"))
+
+    # Reused figure. The first plot solves the layout and the second reuses it.
+    template = cenplot.FigureTemplate()
+    for _ in range(2):
+        tracks, _ = read_case(track_file, chrom)
+        templated = render(
+            tracks, settings, str(tmp_path / "template"), template=template
+        )
+    assert_same_image(default, templated)
+
+    # Rendered in horizontal strips.
+    tracks, _ = read_case(track_file, chrom)
+    width, height = (int(dim * DPI) for dim in settings.dim)
+    tiled = render(
+        tracks,
+        dataclasses.replace(settings, max_tile_pixels=width * height // 4),
+        str(tmp_path / "tiled"),
+    )
+    assert_same_image(default, tiled)
+
+    # Data memory-mapped from Arrow IPC files.
+    tracks, _ = read_case(track_file, chrom)
+    shared = cenplot.SharedTracks.write(tracks, str(tmp_path / "shared")).read()
+    assert_same_tracks(tracks, shared)
+    assert_same_image(default, render(shared, settings, str(tmp_path / "shared")))
+
+
+@pytest.mark.parametrize(["track_file", "chrom"], CASES)
+def test_cached_tracks(track_file: str, chrom: str | None, tmp_path, monkeypatch):
+    tracks, _ = read_case(track_file, chrom)
+    monkeypatch.setenv("CENPLOT_CACHE_DIR", str(tmp_path))
+    # Written then read from the cache.
+    for _ in range(2):
+        with open(track_file, "rb") as fh:
+            track_list, _ = cenplot.read_tracks(fh, chrom=get_chrom(chrom))
+        assert_same_tracks(tracks, track_list.tracks)